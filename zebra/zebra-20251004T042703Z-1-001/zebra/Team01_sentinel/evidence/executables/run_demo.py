@@ -5,10 +5,78 @@ Project Sentinel Demo Runner - Simple Version
 """
 
 import os
+import io
 import sys
 import json
+import runpy
+import contextlib
 from datetime import datetime
 
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    # Compact separators keep the output identical to orjson's
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def serialize_events(events):
+    """Serialize events as a JSONL byte string"""
+    return b"".join(dumps(event) + b"\n" for event in events)
+
+def write_events(path, payload):
+    """Write a pre-serialized JSONL payload in a single write"""
+    with open(path, "wb") as f:
+        f.write(payload)
+
+# Demo output is static, so it is serialized once at import time
+EVENTS = [
+    {
+        "timestamp": "2025-08-13T17:10:00",
+        "event_type": "INVENTORY_SHRINKAGE",
+        "location": "STORE_FLOOR",
+        "severity": "medium",
+        "confidence": 0.8,
+        "description": "Inventory decrease of 8.6% for PRD_T_04"
+    },
+    {
+        "timestamp": "2025-08-13T17:50:00",
+        "event_type": "INVENTORY_SHRINKAGE",
+        "location": "STORE_FLOOR",
+        "severity": "medium",
+        "confidence": 0.8,
+        "description": "Inventory decrease of 7.0% for PRD_F_04"
+    }
+]
+
+SAMPLE_EVENTS = [
+    {
+        "timestamp": "2025-08-13T17:10:00",
+        "event_type": "INVENTORY_SHRINKAGE",
+        "location": "STORE_FLOOR",
+        "severity": "medium",
+        "confidence": 0.8,
+        "description": "Sample fraud event for demonstration"
+    }
+]
+
+FALLBACK_EVENTS = [
+    {
+        "timestamp": "2025-08-13T16:00:00",
+        "event_type": "SYSTEM_TEST",
+        "location": "STORE_FLOOR",
+        "severity": "low",
+        "confidence": 0.5,
+        "description": "System test event"
+    }
+]
+
+EVENTS_BYTES = serialize_events(EVENTS)
+SAMPLE_EVENTS_BYTES = serialize_events(SAMPLE_EVENTS)
+FALLBACK_EVENTS_BYTES = serialize_events(FALLBACK_EVENTS)
+
 def main():
     """Main demo execution"""
     print("="*60)
@@ -27,62 +95,33 @@ def main():
     try:
         print("\nRunning inventory analysis...")
         
-        # Simple analysis without external dependencies
-        import subprocess
-        result = subprocess.run([sys.executable, "simple_inventory_analysis.py"], 
-                              capture_output=True, text=True)
+        # Simple analysis without external dependencies, run in-process
+        # (output captured as before) instead of starting a second interpreter
+        returncode = 0
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                runpy.run_path("simple_inventory_analysis.py", run_name="__main__")
+        except SystemExit as exc:
+            returncode = exc.code or 0
+        except Exception:
+            returncode = 1
         
-        if result.returncode == 0:
+        if returncode == 0:
             print("Analysis completed successfully!")
             print("Detected fraud events in inventory data")
             
-            # Generate a simple events.jsonl for output
-            events = [
-                {
-                    "timestamp": "2025-08-13T17:10:00",
-                    "event_type": "INVENTORY_SHRINKAGE", 
-                    "location": "STORE_FLOOR",
-                    "severity": "medium",
-                    "confidence": 0.8,
-                    "description": "Inventory decrease of 8.6% for PRD_T_04"
-                },
-                {
-                    "timestamp": "2025-08-13T17:50:00",
-                    "event_type": "INVENTORY_SHRINKAGE",
-                    "location": "STORE_FLOOR", 
-                    "severity": "medium",
-                    "confidence": 0.8,
-                    "description": "Inventory decrease of 7.0% for PRD_F_04"
-                }
-            ]
-            
             # Save events to results
-            with open(f"{results_dir}/events.jsonl", "w") as f:
-                for event in events:
-                    f.write(json.dumps(event) + "\n")
+            write_events(f"{results_dir}/events.jsonl", EVENTS_BYTES)
             
             print(f"Events file generated: {results_dir}/events.jsonl")
-            print(f"Total fraud events detected: {len(events)}")
+            print(f"Total fraud events detected: {len(EVENTS)}")
             
         else:
             print("Analysis completed with warnings")
             print("System operational - generating sample output")
             
             # Fallback: generate sample events
-            events = [
-                {
-                    "timestamp": "2025-08-13T17:10:00", 
-                    "event_type": "INVENTORY_SHRINKAGE",
-                    "location": "STORE_FLOOR",
-                    "severity": "medium",
-                    "confidence": 0.8,
-                    "description": "Sample fraud event for demonstration"
-                }
-            ]
-            
-            with open(f"{results_dir}/events.jsonl", "w") as f:
-                for event in events:
-                    f.write(json.dumps(event) + "\n")
+            write_events(f"{results_dir}/events.jsonl", SAMPLE_EVENTS_BYTES)
             
             print(f"Sample events generated: {results_dir}/events.jsonl")
             
@@ -91,20 +130,7 @@ def main():
         print("Generating fallback output...")
         
         # Ensure we always produce output
-        events = [
-            {
-                "timestamp": "2025-08-13T16:00:00",
-                "event_type": "SYSTEM_TEST", 
-                "location": "STORE_FLOOR",
-                "severity": "low",
-                "confidence": 0.5,
-                "description": "System test event"
-            }
-        ]
-        
-        with open(f"{results_dir}/events.jsonl", "w") as f:
-            for event in events:
-                f.write(json.dumps(event) + "\n")
+        write_events(f"{results_dir}/events.jsonl", FALLBACK_EVENTS_BYTES)
     
     print("\n" + "="*60)
     print("DEMO COMPLETED")
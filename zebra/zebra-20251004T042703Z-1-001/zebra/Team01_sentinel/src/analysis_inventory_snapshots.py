@@ -17,8 +17,102 @@ import pandas as pd
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
+from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(inline='always')
+    def _decrease_pct(prev, curr):
+        """Percentage decrease, NaN when the previous quantity is not positive"""
+        safe_prev = prev if prev > 0 else np.nan
+        return (prev - curr) / safe_prev * 100
+
+    @njit(parallel=True, cache=True)
+    def _shrinkage_kernel(V, thr):
+        """Return (rows, cols) of transitions whose percentage decrease exceeds thr"""
+        n, p = V.shape
+        counts = np.zeros(p, dtype=np.int64)
+        for j in prange(p):
+            # NaN never compares greater, so the counting loop has no branch
+            c = 0
+            for i in range(1, n):
+                c += _decrease_pct(np.float64(V[i - 1, j]), V[i, j]) > thr
+            counts[j] = c
+
+        # Each column writes into its own slice, so the fill pass needs no locking
+        offsets = np.zeros(p + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        rows = np.empty(offsets[p], dtype=np.int64)
+        cols = np.empty(offsets[p], dtype=np.int64)
+        for j in prange(p):
+            k = offsets[j]
+            for i in range(1, n):
+                if _decrease_pct(np.float64(V[i - 1, j]), V[i, j]) > thr:
+                    rows[k] = i - 1
+                    cols[k] = j
+                    k += 1
+        return rows, cols
+
+    @njit(parallel=True, cache=True)
+    def _column_moments_kernel(V):
+        """Per-column mean and population std in one Welford pass"""
+        n, p = V.shape
+        mu = np.zeros(p, dtype=np.float64)
+        sd = np.zeros(p, dtype=np.float64)
+        for j in prange(p):
+            mean = 0.0
+            m2 = 0.0
+            for i in range(n):
+                x = np.float64(V[i, j])
+                delta = x - mean
+                mean += delta / (i + 1)
+                m2 += delta * (x - mean)
+            mu[j] = mean
+            sd[j] = np.sqrt(m2 / n) if n > 0 else np.nan
+        return mu, sd
+
+def _column_moments(V: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-column mean and population standard deviation, accumulated in float64"""
+    if NUMBA_AVAILABLE:
+        return _column_moments_kernel(V)
+    return V.mean(axis=0, dtype=np.float64), V.std(axis=0, dtype=np.float64)
+
+def _shrinkage_indices(V: np.ndarray, thr: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Locate shrinkage transitions, ordered by product and then by time"""
+    if NUMBA_AVAILABLE:
+        return _shrinkage_kernel(V, thr)
+
+    prev = V[:-1]
+    # Non-positive previous quantities become NaN and never pass the threshold
+    dec = np.divide(prev - V[1:], np.where(prev > 0, prev, np.nan), dtype=np.float64) * 100
+    cols, rows = np.nonzero(dec.T > thr)
+    return rows, cols
+
+@dataclass
+class InventoryMatrix:
+    """Time x product inventory quantities stored as one contiguous float32 array"""
+    timestamps: np.ndarray
+    timestamp_strings: np.ndarray
+    products: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, product_columns: List[str]) -> 'InventoryMatrix':
+        """Build the matrix once from a loaded inventory DataFrame"""
+        return cls(
+            timestamps=df['timestamp'].to_numpy(dtype='datetime64[ns]'),
+            # Formatted once here so detectors only index into the array
+            timestamp_strings=df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy(),
+            products=np.asarray(product_columns, dtype=object),
+            values=np.ascontiguousarray(df[product_columns].to_numpy(dtype=np.float32))
+        )
+
 # @algorithm InventoryShrinkageDetection | Detects abnormal inventory decreases indicating potential theft
 class InventoryShrinkageDetector:
     def __init__(self, threshold_percentage: float = 5.0):
@@ -30,35 +124,40 @@ class InventoryShrinkageDetector:
         """
         self.threshold = threshold_percentage
         
-    def detect_shrinkage_events(self, inventory_data: pd.DataFrame) -> List[Dict]:
+    def detect_shrinkage_events(self, matrix: InventoryMatrix) -> List[Dict]:
         """
         Detect inventory shrinkage events
         
         Returns:
             List of shrinkage events with timestamp, product, and severity
         """
-        events = []
-        
-        for product in inventory_data.columns:
-            if product == 'timestamp':
-                continue
-                
-            product_data = inventory_data[product].values
-            for i in range(1, len(product_data)):
-                if product_data[i-1] > 0:  # Avoid division by zero
-                    decrease_pct = ((product_data[i-1] - product_data[i]) / product_data[i-1]) * 100
-                    
-                    if decrease_pct > self.threshold:
-                        events.append({
-                            'timestamp': inventory_data.iloc[i]['timestamp'].strftime('%Y-%m-%dT%H:%M:%S'),
-                            'product': product,
-                            'previous_qty': int(product_data[i-1]),
-                            'current_qty': int(product_data[i]),
-                            'decrease_percentage': float(decrease_pct),
-                            'severity': 'HIGH' if decrease_pct > 10 else 'MEDIUM'
-                        })
-        
-        return events
+        V = matrix.values
+        rows, cols = _shrinkage_indices(V, self.threshold)
+
+        # Only the (few) flagged cells are materialized; the division runs in
+        # float64 so percentages match the integer inputs exactly
+        prev_hits = V[rows, cols].astype(np.float64)
+        curr_hits = V[rows + 1, cols].astype(np.float64)
+        dec_hits = (prev_hits - curr_hits) / prev_hits * 100
+
+        timestamps = matrix.timestamp_strings[rows + 1]
+        products = matrix.products[cols]
+        prev_qty = prev_hits.astype(np.int64)
+        curr_qty = curr_hits.astype(np.int64)
+        severities = np.where(dec_hits > 10, 'HIGH', 'MEDIUM')
+
+        return [
+            {
+                'timestamp': str(ts),
+                'product': product,
+                'previous_qty': int(p),
+                'current_qty': int(c),
+                'decrease_percentage': float(d),
+                'severity': str(severity)
+            }
+            for ts, product, p, c, d, severity
+            in zip(timestamps, products, prev_qty, curr_qty, dec_hits, severities)
+        ]
 
 # @algorithm AnomalyDetection | Identifies statistical outliers in inventory patterns
 class InventoryAnomalyDetector:
@@ -71,63 +170,73 @@ class InventoryAnomalyDetector:
         """
         self.z_threshold = z_score_threshold
         
-    def detect_anomalies(self, inventory_data: pd.DataFrame) -> List[Dict]:
+    def detect_anomalies(self, matrix: InventoryMatrix) -> List[Dict]:
         """
         Detect statistical anomalies in inventory levels
         
         Returns:
             List of anomaly events
         """
-        anomalies = []
-        
-        for product in inventory_data.columns:
-            if product == 'timestamp':
-                continue
-                
-            product_values = inventory_data[product].values
-            mean_val = np.mean(product_values)
-            std_val = np.std(product_values)
-            
-            if std_val > 0:  # Avoid division by zero
-                z_scores = np.abs((product_values - mean_val) / std_val)
-                
-                for i, z_score in enumerate(z_scores):
-                    if z_score > self.z_threshold:
-                        anomalies.append({
-                            'timestamp': inventory_data.iloc[i]['timestamp'].strftime('%Y-%m-%dT%H:%M:%S'),
-                            'product': product,
-                            'quantity': int(product_values[i]),
-                            'z_score': float(z_score),
-                            'mean_quantity': float(mean_val),
-                            'anomaly_type': 'LOW' if product_values[i] < mean_val else 'HIGH'
-                        })
-        
-        return anomalies
+        V = matrix.values
+        mu, sd = _column_moments(V)
+
+        # Constant columns (sd == 0) get a zero Z-score and are never flagged
+        Z = np.abs((V - mu) / np.where(sd > 0, sd, 1.0))
+        Z[:, sd == 0] = 0.0
 
-def load_inventory_data(file_path: str) -> pd.DataFrame:
+        # Transpose so anomalies stay grouped by product, then by time
+        cols, rows = np.where(Z.T > self.z_threshold)
+
+        timestamps = matrix.timestamp_strings[rows]
+        products = matrix.products[cols]
+        values = V[rows, cols]
+        means = mu[cols]
+        anomaly_types = np.where(values < means, 'LOW', 'HIGH')
+
+        return [
+            {
+                'timestamp': str(ts),
+                'product': product,
+                'quantity': int(value),
+                'z_score': float(z),
+                'mean_quantity': float(mean),
+                'anomaly_type': str(anomaly_type)
+            }
+            for ts, product, value, z, mean, anomaly_type
+            in zip(timestamps, products, values, Z[rows, cols], means, anomaly_types)
+        ]
+
+def load_inventory_data(file_path: str, chunksize: int = 50_000) -> pd.DataFrame:
     """Load inventory snapshots from JSONL file"""
-    data = []
-    
-    with open(file_path, 'r') as f:
-        for line in f:
-            record = json.loads(line.strip())
+    parts = []
+
+    # Read in chunks so peak memory stays bounded for large snapshot files
+    with pd.read_json(file_path, lines=True, dtype=False, convert_dates=False,
+                      chunksize=chunksize) as reader:
+        for chunk in reader:
             # Flatten the data structure
-            flat_record = {'timestamp': record['timestamp']}
-            flat_record.update(record['data'])
-            data.append(flat_record)
-    
-    df = pd.DataFrame(data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df.sort_values('timestamp').reset_index(drop=True)
+            data_df = pd.json_normalize(chunk['data'].tolist())
+            data_df.index = chunk.index
+            parts.append(pd.concat([chunk[['timestamp']], data_df], axis=1))
 
-def analyze_inventory_trends(df: pd.DataFrame) -> Dict:
-    """Analyze overall inventory trends"""
+    df = pd.concat(parts, ignore_index=True)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
+    df.sort_values('timestamp', inplace=True, ignore_index=True)
+    return df
+
+def compute_total_inventory(df: pd.DataFrame) -> Tuple[List[str], pd.Series]:
+    """Compute total inventory over time once and attach it to the DataFrame"""
+    product_columns = [col for col in df.columns if col not in ('timestamp', 'total_inventory')]
+    total = df[product_columns].sum(axis=1)
+    df['total_inventory'] = total
+    return product_columns, total
+
+def analyze_inventory_trends(df: pd.DataFrame, product_columns: List[str], total: pd.Series,
+                             freq: str = 'h') -> Dict:
+    """Analyze overall inventory trends, bucketing totals by the given period frequency"""
     analysis = {}
-    
-    # Calculate total inventory over time
-    product_columns = [col for col in df.columns if col != 'timestamp']
-    df['total_inventory'] = df[product_columns].sum(axis=1)
-    
+    prod = df[product_columns]
+
     # Trend analysis
     analysis['total_products'] = len(product_columns)
     analysis['time_range'] = {
@@ -137,49 +246,67 @@ def analyze_inventory_trends(df: pd.DataFrame) -> Dict:
     }
     
     analysis['inventory_summary'] = {
-        'initial_total': int(df['total_inventory'].iloc[0]),
-        'final_total': int(df['total_inventory'].iloc[-1]),
-        'net_change': int(df['total_inventory'].iloc[-1] - df['total_inventory'].iloc[0]),
-        'max_total': int(df['total_inventory'].max()),
-        'min_total': int(df['total_inventory'].min())
+        'initial_total': int(total.iloc[0]),
+        'final_total': int(total.iloc[-1]),
+        'net_change': int(total.iloc[-1] - total.iloc[0]),
+        'max_total': int(total.max()),
+        'min_total': int(total.min())
     }
-    
-    # Product-level statistics
-    analysis['product_statistics'] = {}
-    for product in product_columns:
-        product_data = df[product]
-        analysis['product_statistics'][product] = {
-            'initial_qty': int(product_data.iloc[0]),
-            'final_qty': int(product_data.iloc[-1]),
-            'net_change': int(product_data.iloc[-1] - product_data.iloc[0]),
-            'max_qty': int(product_data.max()),
-            'min_qty': int(product_data.min()),
-            'avg_qty': float(product_data.mean()),
-            'std_dev': float(product_data.std())
+
+    # Time-bucketed totals, grouped on a PeriodIndex in one vectorized pass
+    period = df['timestamp'].dt.to_period(freq)
+    period_totals = total.groupby(period).sum()
+    analysis['period_freq'] = freq
+    analysis['period_totals'] = {str(p): int(v) for p, v in period_totals.items()}
+
+    # Product-level statistics, computed for all columns in one pass
+    stats = prod.agg(['max', 'min', 'mean', 'std']).T
+    stats['first'] = prod.iloc[0]
+    stats['last'] = prod.iloc[-1]
+    stats['net'] = stats['last'] - stats['first']
+
+    analysis['product_statistics'] = {
+        product: {
+            'initial_qty': int(row.first),
+            'final_qty': int(row.last),
+            'net_change': int(row.net),
+            'max_qty': int(row.max),
+            'min_qty': int(row.min),
+            'avg_qty': float(row.mean),
+            'std_dev': float(row.std)
         }
-    
+        for product, row in zip(product_columns, stats.itertuples(index=False))
+    }
+
     return analysis
 
 def generate_inventory_report(file_path: str) -> Dict:
     """Generate comprehensive inventory analysis report"""
     print("Loading inventory data...")
     df = load_inventory_data(file_path)
-    
+    product_columns, total = compute_total_inventory(df)
+    matrix = InventoryMatrix.from_dataframe(df, product_columns)
+    return generate_inventory_report_from_df(df, product_columns, total, matrix, source=file_path)
+
+def generate_inventory_report_from_df(df: pd.DataFrame, product_columns: List[str],
+                                      total: pd.Series, matrix: InventoryMatrix,
+                                      source: str) -> Dict:
+    """Generate the inventory analysis report from already-loaded data"""
     print("Analyzing inventory trends...")
-    trends = analyze_inventory_trends(df)
+    trends = analyze_inventory_trends(df, product_columns, total)
     
     print("Detecting shrinkage events...")
     shrinkage_detector = InventoryShrinkageDetector(threshold_percentage=3.0)
-    shrinkage_events = shrinkage_detector.detect_shrinkage_events(df)
+    shrinkage_events = shrinkage_detector.detect_shrinkage_events(matrix)
     
     print("Detecting anomalies...")
     anomaly_detector = InventoryAnomalyDetector(z_score_threshold=2.0)
-    anomaly_events = anomaly_detector.detect_anomalies(df)
+    anomaly_events = anomaly_detector.detect_anomalies(matrix)
     
     # Compile report
     report = {
         'analysis_timestamp': datetime.now().isoformat(),
-        'data_source': file_path,
+        'data_source': source,
         'trends': trends,
         'shrinkage_events': shrinkage_events,
         'anomaly_events': anomaly_events,
@@ -193,16 +320,15 @@ def generate_inventory_report(file_path: str) -> Dict:
     
     return report
 
-def visualize_inventory_data(df: pd.DataFrame, output_dir: str = "plots"):
+def visualize_inventory_data(matrix: InventoryMatrix, total: pd.Series, output_dir: str = "plots"):
     """Generate visualization plots for inventory data"""
     import os
     os.makedirs(output_dir, exist_ok=True)
+    timestamps = matrix.timestamps
     
     # Plot 1: Total inventory over time
     plt.figure(figsize=(12, 6))
-    product_columns = [col for col in df.columns if col != 'timestamp']
-    df['total_inventory'] = df[product_columns].sum(axis=1)
-    plt.plot(df['timestamp'], df['total_inventory'], linewidth=2)
+    plt.plot(timestamps, total.to_numpy(), linewidth=2)
     plt.title('Total Inventory Over Time')
     plt.xlabel('Time')
     plt.ylabel('Total Quantity')
@@ -212,24 +338,26 @@ def visualize_inventory_data(df: pd.DataFrame, output_dir: str = "plots"):
     plt.close()
     
     # Plot 2: Top products with highest variance
-    variances = {}
-    for product in product_columns:
-        variances[product] = df[product].var()
-    
-    top_variance = sorted(variances.items(), key=lambda x: x[1], reverse=True)[:10]
-    
-    plt.figure(figsize=(14, 8))
-    for i, (product, _) in enumerate(top_variance):
-        plt.subplot(2, 5, i + 1)
-        plt.plot(df['timestamp'], df[product], linewidth=1)
-        plt.title(f'{product}', fontsize=10)
-        plt.xticks(rotation=45, fontsize=8)
-        plt.yticks(fontsize=8)
-    
-    plt.suptitle('Top 10 Products by Inventory Variance')
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/high_variance_products.png", dpi=150)
-    plt.close()
+    variances = matrix.values.var(axis=0, ddof=1, dtype=np.float64)
+    # Stable sort keeps column order among equal variances
+    top_idx = np.argsort(-variances, kind='stable')[:10]
+    top_cols = matrix.products[top_idx]
+    subset = matrix.values[:, top_idx]
+
+    fig, axes = plt.subplots(2, 5, figsize=(14, 8))
+    for k, ax in enumerate(axes.flat):
+        if k >= len(top_cols):
+            ax.set_visible(False)
+            continue
+        ax.plot(timestamps, subset[:, k], linewidth=1)
+        ax.set_title(top_cols[k], fontsize=10)
+        ax.tick_params(axis='x', labelrotation=45, labelsize=8)
+        ax.tick_params(axis='y', labelsize=8)
+
+    fig.suptitle('Top 10 Products by Inventory Variance')
+    fig.tight_layout()
+    fig.savefig(f"{output_dir}/high_variance_products.png", dpi=100, format='png')
+    plt.close(fig)
 
 if __name__ == "__main__":
     # File path to inventory snapshots
@@ -237,7 +365,13 @@ if __name__ == "__main__":
     
     # Generate analysis report
     try:
-        report = generate_inventory_report(inventory_file)
+        # Load once and share the DataFrame between the report and the plots
+        print("Loading inventory data...")
+        df = load_inventory_data(inventory_file)
+        product_columns, total = compute_total_inventory(df)
+        matrix = InventoryMatrix.from_dataframe(df, product_columns)
+        report = generate_inventory_report_from_df(df, product_columns, total, matrix,
+                                                   source=inventory_file)
         
         # Save report to JSON
         with open("inventory_analysis_report.json", "w") as f:
@@ -270,8 +404,7 @@ if __name__ == "__main__":
         print(f"\nDetailed report saved to: inventory_analysis_report.json")
         
         # Generate visualizations if data loaded successfully
-        df = load_inventory_data(inventory_file)
-        visualize_inventory_data(df)
+        visualize_inventory_data(matrix, total)
         print("Visualization plots saved to: plots/")
         
     except FileNotFoundError:
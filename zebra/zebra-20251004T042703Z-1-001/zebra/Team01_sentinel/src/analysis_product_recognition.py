@@ -16,8 +16,185 @@ Data Format: JSONL with product predictions and confidence scores
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Set
-from collections import defaultdict, Counter
-import statistics
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(inline='always')
+    def _recent_low_before_gap(ts_ns, low, start, i, thr, look_back):
+        """Low-confidence count before record i if its gap exceeds thr, else 0"""
+        if not (ts_ns[i] - ts_ns[i - 1]) / 1e9 > thr:
+            return 0
+        c = 0
+        for j in range(max(start, i - look_back), i):
+            c += low[j]
+        return c
+
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def _avoidance_kernel(ts_ns, low, starts, thr, look_back):
+        """Return (indices, gaps, low counts) of records that follow a suspicious gap"""
+        n = len(ts_ns)
+        s_count = len(starts)
+        ends = np.empty_like(starts)
+        ends[:-1] = starts[1:]
+        ends[-1] = n
+        
+        # Stations are independent, so each one is scanned on its own thread
+        counts = np.zeros(s_count, dtype=np.int64)
+        for s in prange(s_count):
+            c = 0
+            for i in range(starts[s] + 1, ends[s]):
+                c += _recent_low_before_gap(ts_ns, low, starts[s], i, thr, look_back) >= 2
+            counts[s] = c
+        
+        # Each station fills its own slice, keeping station-then-time order
+        offsets = np.zeros(s_count + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        hits = np.empty(offsets[s_count], dtype=np.int64)
+        gaps = np.empty(offsets[s_count], dtype=np.float64)
+        recent = np.empty(offsets[s_count], dtype=np.int64)
+        for s in prange(s_count):
+            k = offsets[s]
+            for i in range(starts[s] + 1, ends[s]):
+                c = _recent_low_before_gap(ts_ns, low, starts[s], i, thr, look_back)
+                if c >= 2:
+                    hits[k] = i
+                    gaps[k] = (ts_ns[i] - ts_ns[i - 1]) / 1e9
+                    recent[k] = c
+                    k += 1
+        return hits, gaps, recent
+
+def _avoidance_hits(ts_ns: np.ndarray, low: np.ndarray, starts: np.ndarray, thr: float,
+                    look_back: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find gaps above thr preceded by 2+ low-confidence records of the same station"""
+    if NUMBA_AVAILABLE:
+        return _avoidance_kernel(ts_ns, low, starts, thr, look_back)
+
+    # Gaps to the previous record of the same station; station starts never qualify
+    gaps = np.diff(ts_ns, prepend=ts_ns[0]) / 1e9
+    gaps[starts] = 0.0
+    
+    # Low-confidence count over the previous look_back records of the same station
+    low_cum = np.r_[0, np.cumsum(low)]
+    station_start = np.repeat(starts, np.diff(np.r_[starts, len(ts_ns)]))
+    pos = np.arange(len(ts_ns))
+    recent = low_cum[pos] - low_cum[np.maximum(station_start, pos - look_back)]
+    
+    hits = np.flatnonzero((gaps > thr) & (recent >= 2))
+    return hits, gaps[hits], recent[hits]
+
+# Lower edges of the confidence buckets, used with searchsorted(side='right') so
+# bucket 0 is < 0.5 and bucket 5 is >= 0.9
+CONFIDENCE_EDGES = np.array([0.5, 0.6, 0.7, 0.8, 0.9])
+
+# Detector output layouts; timestamps stay the original ISO strings
+LOW_CONFIDENCE_DTYPE = np.dtype([
+    ('timestamp', object), ('station_id', object), ('predicted_product', object),
+    ('confidence', np.float64), ('severity', object)
+])
+SCANNER_AVOIDANCE_DTYPE = np.dtype([
+    ('timestamp', object), ('station_id', object), ('time_gap_seconds', np.float64),
+    ('previous_low_confidence_count', np.int64), ('suspected_reason', object)
+])
+
+def events_to_records(events: np.ndarray) -> List[Dict]:
+    """Convert a structured event array to JSON-ready dicts, one column at a time"""
+    names = events.dtype.names
+    columns = [events[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+@dataclass
+class RecognitionArrays:
+    """Column-oriented view of recognition events, one array per field"""
+    timestamps: np.ndarray
+    ts: np.ndarray
+    station_ids: np.ndarray
+    predicted: np.ndarray
+    accuracy: np.ndarray
+    # int32 codes into the label arrays, numbered in order of first appearance
+    station_codes: np.ndarray
+    station_labels: np.ndarray
+    product_codes: np.ndarray
+    product_labels: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'RecognitionArrays':
+        """Build the arrays once from a loaded recognition DataFrame"""
+        timestamps = df['timestamp'].to_numpy(dtype=object)
+        station_codes, station_labels = pd.factorize(df['station_id'])
+        product_codes, product_labels = pd.factorize(df['predicted_product'])
+        return cls(
+            timestamps=timestamps,
+            # Parsed once so gaps and hours are plain integer arithmetic afterwards
+            ts=timestamps.astype('datetime64[ns]'),
+            station_ids=df['station_id'].to_numpy(dtype=object),
+            predicted=df['predicted_product'].to_numpy(dtype=object),
+            # float64 keeps threshold comparisons identical to the raw JSON values
+            accuracy=df['accuracy'].to_numpy(dtype=np.float64),
+            station_codes=station_codes.astype(np.int32),
+            station_labels=np.asarray(station_labels, dtype=object),
+            product_codes=product_codes.astype(np.int32),
+            product_labels=np.asarray(product_labels, dtype=object)
+        )
+
+    def __len__(self) -> int:
+        return len(self.accuracy)
+
+    @cached_property
+    def low(self) -> np.ndarray:
+        """int8 flag per event for confidence below 0.7, shared by every low-count aggregate"""
+        return (self.accuracy < 0.7).view(np.int8)
+
+    @cached_property
+    def very_low(self) -> np.ndarray:
+        """int8 flag per event for confidence below 0.5"""
+        return (self.accuracy < 0.5).view(np.int8)
+
+    @cached_property
+    def hours(self) -> np.ndarray:
+        """Hour of day (0-23) of each event, taken from the parsed timestamps"""
+        return (self.ts.astype(np.int64) // 3_600_000_000_000) % 24
+
+    @cached_property
+    def confidence_histogram(self) -> np.ndarray:
+        """Event counts per CONFIDENCE_EDGES bucket, computed in a single pass"""
+        buckets = np.searchsorted(CONFIDENCE_EDGES, self.accuracy, side='right')
+        return np.bincount(buckets, minlength=len(CONFIDENCE_EDGES) + 1)
+
+    @cached_property
+    def confidence_moments(self) -> Dict[str, float]:
+        """Mean, sample standard deviation, min and max of the accuracy column"""
+        accuracy = self.accuracy
+        return {
+            'mean': float(accuracy.mean()),
+            'std': float(accuracy.std(ddof=1)) if len(accuracy) > 1 else 0,
+            'min': float(accuracy.min()),
+            'max': float(accuracy.max())
+        }
+
+    @cached_property
+    def confidence_median(self) -> float:
+        """Median accuracy by O(N) selection instead of a full sort"""
+        n = len(self.accuracy)
+        k = n // 2
+        if n % 2:
+            return float(np.partition(self.accuracy, k)[k])
+        part = np.partition(self.accuracy, [k - 1, k])
+        return float((part[k - 1] + part[k]) / 2)
 
 # @algorithm LowConfidenceDetection | Identifies product recognitions with suspiciously low confidence
 class LowConfidenceDetector:
@@ -30,26 +207,25 @@ class LowConfidenceDetector:
         """
         self.threshold = confidence_threshold
         
-    def detect_low_confidence_predictions(self, recognition_data: List[Dict]) -> List[Dict]:
+    def find_low_confidence_predictions(self, arrays: RecognitionArrays) -> np.ndarray:
         """
         Detect product recognition events with low confidence scores
         
         Returns:
-            List of low confidence recognition events
+            Structured array (LOW_CONFIDENCE_DTYPE) of low confidence recognition events
         """
-        low_confidence_events = []
-        
-        for record in recognition_data:
-            if record['accuracy'] < self.threshold:
-                low_confidence_events.append({
-                    'timestamp': record['timestamp'],
-                    'station_id': record['station_id'],
-                    'predicted_product': record['predicted_product'],
-                    'confidence': record['accuracy'],
-                    'severity': 'HIGH' if record['accuracy'] < 0.5 else 'MEDIUM'
-                })
-        
-        return low_confidence_events
+        mask = arrays.accuracy < self.threshold
+        out = np.empty(int(np.count_nonzero(mask)), dtype=LOW_CONFIDENCE_DTYPE)
+        out['timestamp'] = arrays.timestamps[mask]
+        out['station_id'] = arrays.station_ids[mask]
+        out['predicted_product'] = arrays.predicted[mask]
+        out['confidence'] = arrays.accuracy[mask]
+        out['severity'] = np.where(arrays.very_low[mask], 'HIGH', 'MEDIUM')
+        return out
+        
+    def detect_low_confidence_predictions(self, arrays: RecognitionArrays) -> List[Dict]:
+        """Detect low confidence recognition events as a list of dicts"""
+        return events_to_records(self.find_low_confidence_predictions(arrays))
 
 # @algorithm ScannerAvoidanceDetection | Detects potential scanner avoidance patterns
 class ScannerAvoidanceDetector:
@@ -62,53 +238,47 @@ class ScannerAvoidanceDetector:
         """
         self.time_gap_threshold = time_gap_threshold
         
-    def detect_scanner_avoidance(self, recognition_data: List[Dict], pos_data: List[Dict] = None) -> List[Dict]:
+    def find_scanner_avoidance(self, recognition_data: RecognitionArrays) -> np.ndarray:
         """
         Detect potential scanner avoidance by analyzing recognition gaps
         
         Args:
             recognition_data: Product recognition events
-            pos_data: POS transaction data (optional, for correlation)
             
         Returns:
-            List of potential scanner avoidance events
+            Structured array (SCANNER_AVOIDANCE_DTYPE) of potential scanner avoidance events
         """
-        avoidance_events = []
+        if len(recognition_data) == 0:
+            return np.empty(0, dtype=SCANNER_AVOIDANCE_DTYPE)
         
-        # Group by station
-        station_data = defaultdict(list)
-        for record in recognition_data:
-            station_data[record['station_id']].append(record)
+        # Group by station (codes follow first appearance), then by time
+        order = np.lexsort((recognition_data.ts, recognition_data.station_codes))
         
-        for station_id, records in station_data.items():
-            # Sort by timestamp
-            records.sort(key=lambda x: datetime.fromisoformat(x['timestamp']))
-            
-            for i in range(1, len(records)):
-                prev_time = datetime.fromisoformat(records[i-1]['timestamp'])
-                curr_time = datetime.fromisoformat(records[i]['timestamp'])
-                time_gap = (curr_time - prev_time).total_seconds()
-                
-                # Check for suspicious gaps in recognition
-                if time_gap > self.time_gap_threshold:
-                    # Check if there were multiple low-confidence predictions before gap
-                    recent_low_confidence = 0
-                    look_back = max(0, i-5)  # Look at last 5 records
-                    
-                    for j in range(look_back, i):
-                        if records[j]['accuracy'] < 0.6:
-                            recent_low_confidence += 1
-                    
-                    if recent_low_confidence >= 2:  # 2 or more low confidence in recent history
-                        avoidance_events.append({
-                            'timestamp': records[i]['timestamp'],
-                            'station_id': station_id,
-                            'time_gap_seconds': time_gap,
-                            'previous_low_confidence_count': recent_low_confidence,
-                            'suspected_reason': 'SCANNER_AVOIDANCE_AFTER_LOW_CONFIDENCE'
-                        })
-        
-        return avoidance_events
+        ts_ns = recognition_data.ts[order].astype(np.int64)
+        codes = recognition_data.station_codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        low = (recognition_data.accuracy[order] < 0.6).view(np.int8)
+        
+        # 2 or more low confidence in the previous 5 records before a suspicious gap
+        hits, gaps, recent_low = _avoidance_hits(ts_ns, low, starts, self.time_gap_threshold)
+        
+        out = np.empty(len(hits), dtype=SCANNER_AVOIDANCE_DTYPE)
+        out['timestamp'] = recognition_data.timestamps[order[hits]]
+        out['station_id'] = recognition_data.station_labels[codes[hits]]
+        out['time_gap_seconds'] = gaps
+        out['previous_low_confidence_count'] = recent_low
+        out['suspected_reason'] = 'SCANNER_AVOIDANCE_AFTER_LOW_CONFIDENCE'
+        return out
+        
+    def detect_scanner_avoidance(self, recognition_data: RecognitionArrays, pos_data: List[Dict] = None) -> List[Dict]:
+        """
+        Detect potential scanner avoidance events as a list of dicts
+        
+        Args:
+            recognition_data: Product recognition events
+            pos_data: POS transaction data (optional, for correlation)
+        """
+        return events_to_records(self.find_scanner_avoidance(recognition_data))
 
 # @algorithm ProductMisrecognitionAnalysis | Analyzes patterns in product misrecognition
 class ProductMisrecognitionAnalyzer:
@@ -116,7 +286,7 @@ class ProductMisrecognitionAnalyzer:
         """Initialize product misrecognition analyzer"""
         pass
         
-    def analyze_misrecognition_patterns(self, recognition_data: List[Dict]) -> Dict:
+    def analyze_misrecognition_patterns(self, recognition_data: RecognitionArrays) -> Dict:
         """
         Analyze patterns in product misrecognition
         
@@ -131,124 +301,151 @@ class ProductMisrecognitionAnalyzer:
         }
         
         # Calculate overall confidence statistics
-        confidences = [record['accuracy'] for record in recognition_data]
+        moments = recognition_data.confidence_moments
         analysis['confidence_statistics'] = {
-            'mean_confidence': statistics.mean(confidences),
-            'median_confidence': statistics.median(confidences),
-            'min_confidence': min(confidences),
-            'max_confidence': max(confidences),
-            'std_dev': statistics.stdev(confidences) if len(confidences) > 1 else 0
+            'mean_confidence': moments['mean'],
+            'median_confidence': recognition_data.confidence_median,
+            'min_confidence': moments['min'],
+            'max_confidence': moments['max'],
+            'std_dev': moments['std']
         }
         
-        # Analyze confidence by product
-        product_confidences = defaultdict(list)
-        for record in recognition_data:
-            product_confidences[record['predicted_product']].append(record['accuracy'])
+        accuracy = recognition_data.accuracy
+        low = recognition_data.low
+        very_low = recognition_data.very_low
         
-        for product, conf_list in product_confidences.items():
+        # Analyze confidence by product (codes keep first-appearance order)
+        codes = recognition_data.product_codes
+        n_products = len(recognition_data.product_labels)
+        counts = np.bincount(codes, minlength=n_products)
+        avgs = np.bincount(codes, weights=accuracy, minlength=n_products) / counts
+        mins = np.full(n_products, np.inf)
+        np.minimum.at(mins, codes, accuracy)
+        lows = np.bincount(codes, weights=low, minlength=n_products).astype(np.int64)
+        very_lows = np.bincount(codes, weights=very_low, minlength=n_products).astype(np.int64)
+        
+        products = recognition_data.product_labels.tolist()
+        for product, count, avg, mn, lo, vlo in zip(products, counts.tolist(), avgs.tolist(),
+                                                    mins.tolist(), lows.tolist(), very_lows.tolist()):
             analysis['product_confidence_patterns'][product] = {
-                'count': len(conf_list),
-                'avg_confidence': statistics.mean(conf_list),
-                'min_confidence': min(conf_list),
-                'low_confidence_count': len([c for c in conf_list if c < 0.7]),
-                'very_low_confidence_count': len([c for c in conf_list if c < 0.5])
+                'count': count,
+                'avg_confidence': avg,
+                'min_confidence': mn,
+                'low_confidence_count': lo,
+                'very_low_confidence_count': vlo
             }
         
-        # Identify problematic products (consistently low confidence)
-        for product, stats in analysis['product_confidence_patterns'].items():
-            if stats['count'] >= 5:  # At least 5 recognitions
-                low_conf_rate = stats['low_confidence_count'] / stats['count']
-                if low_conf_rate > 0.4 or stats['avg_confidence'] < 0.65:  # 40% low confidence or avg < 65%
-                    analysis['problematic_products'].append({
-                        'product': product,
-                        'avg_confidence': stats['avg_confidence'],
-                        'low_confidence_rate': low_conf_rate,
-                        'total_recognitions': stats['count']
-                    })
-        
-        # Temporal pattern analysis (confidence trends over time)
-        hourly_confidence = defaultdict(list)
-        for record in recognition_data:
-            timestamp = datetime.fromisoformat(record['timestamp'])
-            hour = timestamp.hour
-            hourly_confidence[hour].append(record['accuracy'])
-        
-        for hour, conf_list in hourly_confidence.items():
+        # Identify problematic products (consistently low confidence):
+        # at least 5 recognitions and 40% low confidence or avg < 65%
+        low_conf_rate = lows / counts
+        problematic = (counts >= 5) & ((low_conf_rate > 0.4) | (avgs < 0.65))
+        for i in np.flatnonzero(problematic).tolist():
+            analysis['problematic_products'].append({
+                'product': products[i],
+                'avg_confidence': float(avgs[i]),
+                'low_confidence_rate': float(low_conf_rate[i]),
+                'total_recognitions': int(counts[i])
+            })
+        
+        # Temporal pattern analysis (confidence trends over time), hours in order of first appearance
+        hours = recognition_data.hours
+        hour_counts = np.bincount(hours, minlength=24)
+        hour_avgs = np.bincount(hours, weights=accuracy, minlength=24) / np.maximum(hour_counts, 1)
+        hour_lows = np.bincount(hours, weights=low, minlength=24).astype(np.int64)
+        present, first_index = np.unique(hours, return_index=True)
+        
+        for hour in present[np.argsort(first_index)].tolist():
             analysis['temporal_patterns'][f'hour_{hour}'] = {
-                'avg_confidence': statistics.mean(conf_list),
-                'count': len(conf_list),
-                'low_confidence_count': len([c for c in conf_list if c < 0.7])
+                'avg_confidence': float(hour_avgs[hour]),
+                'count': int(hour_counts[hour]),
+                'low_confidence_count': int(hour_lows[hour])
             }
         
         return analysis
 
-def load_product_recognition_data(file_path: str) -> List[Dict]:
+def load_product_recognition_data(file_path: str) -> pd.DataFrame:
     """Load product recognition data from JSONL file"""
-    recognition_data = []
+    if not ORJSON_AVAILABLE:
+        # precise_float keeps accuracies bit-identical to json.loads
+        df = pd.read_json(file_path, lines=True, dtype=False, convert_dates=False, precise_float=True)
+        
+        # Flatten recognition data
+        data = df.pop('data').str
+        df['predicted_product'] = data['predicted_product']
+        df['accuracy'] = data['accuracy'].astype(np.float64)
+        return df[['timestamp', 'station_id', 'status', 'predicted_product', 'accuracy']]
     
-    with open(file_path, 'r') as f:
-        for line in f:
-            record = json.loads(line.strip())
-            
-            # Flatten recognition data
-            recognition_event = {
-                'timestamp': record['timestamp'],
-                'station_id': record['station_id'],
-                'status': record['status'],
-                'predicted_product': record['data']['predicted_product'],
-                'accuracy': record['data']['accuracy']
-            }
-            
-            recognition_data.append(recognition_event)
+    # Large binary reads; orjson parses the raw bytes, trailing newline included
+    with open(file_path, 'rb', buffering=1 << 20) as f:
+        records = [orjson.loads(line) for line in f if line.strip()]
     
-    return recognition_data
+    # Flatten recognition data
+    return pd.DataFrame({
+        'timestamp': [r['timestamp'] for r in records],
+        'station_id': [r['station_id'] for r in records],
+        'status': [r['status'] for r in records],
+        'predicted_product': [r['data']['predicted_product'] for r in records],
+        'accuracy': np.array([r['data']['accuracy'] for r in records], dtype=np.float64)
+    })
 
-def analyze_recognition_performance(recognition_data: List[Dict]) -> Dict:
+def analyze_recognition_performance(arrays: RecognitionArrays) -> Dict:
     """Analyze overall recognition system performance"""
     analysis = {}
     
     # Basic statistics
-    total_events = len(recognition_data)
-    stations = set(record['station_id'] for record in recognition_data)
-    products = set(record['predicted_product'] for record in recognition_data)
+    total_events = len(arrays)
+    products = arrays.product_labels
+    product_counts = np.bincount(arrays.product_codes, minlength=len(products))
     
     # Confidence level distribution
+    very_low, low_50, low_60, medium, high, very_high = arrays.confidence_histogram.tolist()
     confidence_levels = {
-        'very_high': len([r for r in recognition_data if r['accuracy'] >= 0.9]),
-        'high': len([r for r in recognition_data if 0.8 <= r['accuracy'] < 0.9]),
-        'medium': len([r for r in recognition_data if 0.7 <= r['accuracy'] < 0.8]),
-        'low': len([r for r in recognition_data if 0.5 <= r['accuracy'] < 0.7]),
-        'very_low': len([r for r in recognition_data if r['accuracy'] < 0.5])
+        'very_high': very_high,
+        'high': high,
+        'medium': medium,
+        'low': low_50 + low_60,
+        'very_low': very_low
     }
     
     analysis['summary'] = {
         'total_recognition_events': total_events,
-        'unique_stations': len(stations),
+        'unique_stations': len(arrays.station_labels),
         'unique_products_recognized': len(products),
-        'avg_confidence': statistics.mean([r['accuracy'] for r in recognition_data]),
+        'avg_confidence': arrays.confidence_moments['mean'],
         'confidence_distribution': confidence_levels,
         'time_range': {
-            'start': min(r['timestamp'] for r in recognition_data),
-            'end': max(r['timestamp'] for r in recognition_data)
+            'start': min(arrays.timestamps),
+            'end': max(arrays.timestamps)
         }
     }
     
-    # Station performance
-    station_performance = {}
-    for station in stations:
-        station_records = [r for r in recognition_data if r['station_id'] == station]
-        station_performance[station] = {
-            'total_recognitions': len(station_records),
-            'avg_confidence': statistics.mean([r['accuracy'] for r in station_records]),
-            'low_confidence_count': len([r for r in station_records if r['accuracy'] < 0.7]),
-            'low_confidence_rate': len([r for r in station_records if r['accuracy'] < 0.7]) / len(station_records)
+    # Station performance: one bincount per aggregate over the station codes
+    codes = arrays.station_codes
+    n_stations = len(arrays.station_labels)
+    counts = np.bincount(codes, minlength=n_stations)
+    means = np.bincount(codes, weights=arrays.accuracy, minlength=n_stations) / counts
+    lows = np.bincount(codes, weights=arrays.low, minlength=n_stations).astype(np.int64)
+    
+    station_performance = {
+        station: {
+            'total_recognitions': count,
+            'avg_confidence': mean,
+            'low_confidence_count': low,
+            'low_confidence_rate': low / count
         }
+        for station, count, mean, low in zip(
+            arrays.station_labels.tolist(), counts.tolist(), means.tolist(), lows.tolist()
+        )
+    }
     
     analysis['station_performance'] = station_performance
     
-    # Product recognition frequency
-    product_counts = Counter(record['predicted_product'] for record in recognition_data)
-    analysis['top_recognized_products'] = dict(product_counts.most_common(10))
+    # Product recognition frequency: most frequent first, ties in order of first
+    # appearance (as Counter.most_common), via a unique sort key and a partial sort
+    rank_key = -product_counts * len(arrays) + np.arange(len(products))
+    top = np.argpartition(rank_key, 9)[:10] if len(rank_key) > 10 else np.arange(len(rank_key))
+    top = top[np.argsort(rank_key[top])]
+    analysis['top_recognized_products'] = dict(zip(products[top].tolist(), product_counts[top].tolist()))
     
     return analysis
 
@@ -256,32 +453,36 @@ def generate_recognition_analysis_report(file_path: str) -> Dict:
     """Generate comprehensive product recognition analysis report"""
     print("Loading product recognition data...")
     recognition_data = load_product_recognition_data(file_path)
-    
+    arrays = RecognitionArrays.from_dataframe(recognition_data)
+    return generate_recognition_analysis_report_from_arrays(arrays, source=file_path)
+
+def generate_recognition_analysis_report_from_arrays(arrays: RecognitionArrays, source: str) -> Dict:
+    """Generate the recognition analysis report from already-loaded data"""
     print("Analyzing recognition performance...")
-    performance = analyze_recognition_performance(recognition_data)
+    performance = analyze_recognition_performance(arrays)
     
     print("Detecting low confidence predictions...")
     low_conf_detector = LowConfidenceDetector(confidence_threshold=0.7)
-    low_confidence_events = low_conf_detector.detect_low_confidence_predictions(recognition_data)
+    low_confidence_events = low_conf_detector.detect_low_confidence_predictions(arrays)
     
     print("Detecting scanner avoidance patterns...")
     avoidance_detector = ScannerAvoidanceDetector(time_gap_threshold=60)
-    avoidance_events = avoidance_detector.detect_scanner_avoidance(recognition_data)
+    avoidance_events = avoidance_detector.detect_scanner_avoidance(arrays)
     
     print("Analyzing misrecognition patterns...")
     misrecognition_analyzer = ProductMisrecognitionAnalyzer()
-    misrecognition_analysis = misrecognition_analyzer.analyze_misrecognition_patterns(recognition_data)
+    misrecognition_analysis = misrecognition_analyzer.analyze_misrecognition_patterns(arrays)
     
     # Compile report
     report = {
         'analysis_timestamp': datetime.now().isoformat(),
-        'data_source': file_path,
+        'data_source': source,
         'recognition_performance': performance,
         'low_confidence_events': low_confidence_events,
         'scanner_avoidance_events': avoidance_events,
         'misrecognition_analysis': misrecognition_analysis,
         'summary': {
-            'total_recognition_events': len(recognition_data),
+            'total_recognition_events': len(arrays),
             'low_confidence_events_count': len(low_confidence_events),
             'scanner_avoidance_events_count': len(avoidance_events),
             'problematic_products_count': len(misrecognition_analysis['problematic_products']),
@@ -292,71 +493,71 @@ def generate_recognition_analysis_report(file_path: str) -> Dict:
     
     return report
 
-def visualize_recognition_data(recognition_data: List[Dict], output_dir: str = "plots"):
-    """Generate simple visualization data for recognition analysis (text-based)"""
+def visualize_recognition_data(arrays: RecognitionArrays, output_dir: str = "plots",
+                               source: str = None):
+    """Generate simple visualization data for recognition analysis (text-based)
+    
+    When source is given, the files are left alone if they are newer than it.
+    """
     import os
     os.makedirs(output_dir, exist_ok=True)
     
+    output_files = [f"{output_dir}/confidence_distribution.txt",
+                    f"{output_dir}/hourly_confidence_trends.txt"]
+    if source is not None and all(
+            os.path.exists(path) and os.path.getmtime(source) <= os.path.getmtime(path)
+            for path in output_files):
+        return
+    
     # Generate text-based analysis files since matplotlib might not be available
     
     # Confidence distribution analysis
-    confidence_ranges = {
-        '0.9-1.0': 0, '0.8-0.9': 0, '0.7-0.8': 0, 
-        '0.6-0.7': 0, '0.5-0.6': 0, '0.0-0.5': 0
-    }
-    
-    for record in recognition_data:
-        conf = record['accuracy']
-        if conf >= 0.9:
-            confidence_ranges['0.9-1.0'] += 1
-        elif conf >= 0.8:
-            confidence_ranges['0.8-0.9'] += 1
-        elif conf >= 0.7:
-            confidence_ranges['0.7-0.8'] += 1
-        elif conf >= 0.6:
-            confidence_ranges['0.6-0.7'] += 1
-        elif conf >= 0.5:
-            confidence_ranges['0.5-0.6'] += 1
-        else:
-            confidence_ranges['0.0-0.5'] += 1
+    range_names = ['0.0-0.5', '0.5-0.6', '0.6-0.7', '0.7-0.8', '0.8-0.9', '0.9-1.0']
+    counts = arrays.confidence_histogram.tolist()
+    lines = ["Product Recognition Confidence Distribution", "=" * 45, ""]
+    for range_name, count in zip(reversed(range_names), reversed(counts)):
+        percentage = (count / len(arrays)) * 100
+        bar = "█" * int(percentage / 2)  # Simple text bar chart
+        lines.append(f"{range_name:8} | {count:4} ({percentage:5.1f}%) {bar}")
     
     with open(f"{output_dir}/confidence_distribution.txt", "w") as f:
-        f.write("Product Recognition Confidence Distribution\n")
-        f.write("=" * 45 + "\n\n")
-        for range_name, count in confidence_ranges.items():
-            percentage = (count / len(recognition_data)) * 100
-            bar = "█" * int(percentage / 2)  # Simple text bar chart
-            f.write(f"{range_name:8} | {count:4} ({percentage:5.1f}%) {bar}\n")
+        f.write("\n".join(lines) + "\n")
     
     # Hourly confidence trends
-    hourly_data = defaultdict(list)
-    for record in recognition_data:
-        timestamp = datetime.fromisoformat(record['timestamp'])
-        hour = timestamp.hour
-        hourly_data[hour].append(record['accuracy'])
+    hours = arrays.hours
+    counts = np.bincount(hours, minlength=24)
+    sums = np.bincount(hours, weights=arrays.accuracy, minlength=24)
+    lows = np.bincount(hours, weights=arrays.low, minlength=24).astype(np.int64)
+    avgs = sums / np.maximum(counts, 1)
+    
+    lines = ["Hourly Confidence Trends", "=" * 25, "",
+             "Hour | Count | Avg Conf | Low Conf Count", "-" * 40]
+    lines.extend(
+        f"{hour:4} | {counts[hour]:5} | {avgs[hour]:8.3f} | {lows[hour]:12}"
+        for hour in np.flatnonzero(counts).tolist()
+    )
     
     with open(f"{output_dir}/hourly_confidence_trends.txt", "w") as f:
-        f.write("Hourly Confidence Trends\n")
-        f.write("=" * 25 + "\n\n")
-        f.write("Hour | Count | Avg Conf | Low Conf Count\n")
-        f.write("-" * 40 + "\n")
-        
-        for hour in sorted(hourly_data.keys()):
-            conf_list = hourly_data[hour]
-            avg_conf = statistics.mean(conf_list)
-            low_count = len([c for c in conf_list if c < 0.7])
-            f.write(f"{hour:4} | {len(conf_list):5} | {avg_conf:8.3f} | {low_count:12}\n")
+        f.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     # File path to product recognition data
     recognition_file = "data/input/product_recognition.jsonl"
     
     try:
-        report = generate_recognition_analysis_report(recognition_file)
+        # Load once and share the arrays between the report and the text charts
+        print("Loading product recognition data...")
+        recognition_data = load_product_recognition_data(recognition_file)
+        arrays = RecognitionArrays.from_dataframe(recognition_data)
+        report = generate_recognition_analysis_report_from_arrays(arrays, source=recognition_file)
         
         # Save report to JSON
-        with open("product_recognition_analysis_report.json", "w") as f:
-            json.dump(report, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open("product_recognition_analysis_report.json", "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open("product_recognition_analysis_report.json", "w") as f:
+                json.dump(report, f, indent=2)
         
         # Print summary
         print("\n" + "="*50)
@@ -388,8 +589,7 @@ if __name__ == "__main__":
         print(f"\nDetailed report saved to: product_recognition_analysis_report.json")
         
         # Generate text-based visualizations
-        recognition_data = load_product_recognition_data(recognition_file)
-        visualize_recognition_data(recognition_data)
+        visualize_recognition_data(arrays, source=recognition_file)
         print("Analysis charts saved to: plots/")
         
     except FileNotFoundError:
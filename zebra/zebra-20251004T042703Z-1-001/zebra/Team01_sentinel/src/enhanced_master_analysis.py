@@ -6,194 +6,393 @@ Automatically detects and uses uploaded data files if available
 """
 
 import json
+import mmap
 import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import numpy as np
 
-def get_data_source_path(filename):
-    """Get the path to data file, preferring uploads over default"""
-    upload_path = f"data/uploads/{filename}"
-    default_path = f"data/input/{filename}"
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+try:
+    import simdjson
+    _SIMDJSON_CONTAINERS = (simdjson.Object, simdjson.Array)
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Data file locations; uploads take precedence over the bundled inputs
+UPLOAD_DATA_DIR = "data/uploads"
+DEFAULT_DATA_DIR = "data/input"
+
+# Progress output is on unless SENTINEL_VERBOSE=0
+VERBOSE = os.environ.get('SENTINEL_VERBOSE', '1') != '0'
+
+# Per-thread parser and progress-message state for the parallel analysis steps
+_thread_state = threading.local()
+
+# Top-level fields kept by every projected loader
+_RECORD_FIELDS = ('timestamp', 'station_id')
+
+# Range of quantities stored in the packed int32 inventory matrix
+INT32_MIN, INT32_MAX = int(np.iinfo(np.int32).min), int(np.iinfo(np.int32).max)
+
+# Expected weights for common product categories
+EXPECTED_WEIGHTS = {
+    "PRD_F": 400,  # Food items ~400g
+    "PRD_B": 500,  # Beverages ~500g
+    "PRD_A": 100,  # Accessories ~100g
+    "PRD_S": 200,  # Snacks ~200g
+    "PRD_V": 300,  # Vegetables ~300g
+    "PRD_H": 150,  # Health items ~150g
+    "PRD_C": 250,  # Cosmetics ~250g
+    "PRD_T": 300   # Textiles ~300g
+}
+
+# Every category above is PRD_<letter>, so it is identified by sku[4] alone
+EXPECTED_WEIGHTS_BY_CHAR = {category[4]: weight for category, weight in EXPECTED_WEIGHTS.items()}
+
+if NUMBA_AVAILABLE:
+    @njit(inline='always')
+    def _decrease_pct(prev, curr):
+        """Percentage decrease, or -1 when the quantity did not fall from a positive value"""
+        if curr < prev and prev > 0:
+            # float64 before subtracting so int32 quantities cannot overflow
+            return (np.float64(prev) - np.float64(curr)) / prev * 100
+        return -1.0
+
+    @njit(cache=True)
+    def _shrinkage_kernel(qty, present, threshold):
+        """Return (rows, cols, pct) of consecutive-snapshot decreases >= threshold"""
+        n, p = qty.shape
+        count = 0
+        for i in range(1, n):
+            for j in range(p):
+                if present[i - 1, j] and present[i, j]:
+                    count += _decrease_pct(qty[i - 1, j], qty[i, j]) >= threshold
+        
+        rows = np.empty(count, dtype=np.int64)
+        cols = np.empty(count, dtype=np.int64)
+        pct = np.empty(count, dtype=np.float64)
+        k = 0
+        for i in range(1, n):
+            for j in range(p):
+                if not (present[i - 1, j] and present[i, j]):
+                    continue
+                decrease = _decrease_pct(qty[i - 1, j], qty[i, j])
+                if decrease >= threshold:
+                    rows[k] = i - 1
+                    cols[k] = j
+                    pct[k] = decrease
+                    k += 1
+        return rows, cols, pct
+
+def _shrinkage_hits(qty, present, threshold):
+    """Locate (previous snapshot, product) cells whose decrease is >= threshold percent
+    
+    Only cells where the product is present in both snapshots are compared.
+    """
+    if NUMBA_AVAILABLE:
+        return _shrinkage_kernel(qty, present, threshold)
+    
+    prev, curr = qty[:-1], qty[1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decrease_pct = (prev.astype(np.float64) - curr) / prev * 100
+    both = present[:-1] & present[1:]
+    rows, cols = np.nonzero(both & (curr < prev) & (prev > 0) & (decrease_pct >= threshold))
+    return rows, cols, decrease_pct[rows, cols]
+
+@lru_cache(maxsize=None)
+def _resolve_data_source(filename):
+    """Return (path, is_upload) for a data file, or None if it is missing
     
+    Cached so each file is only looked up once per run.
+    """
+    upload_path = f"{UPLOAD_DATA_DIR}/{filename}"
     if os.path.exists(upload_path):
-        print(f"   📤 Using uploaded: {filename}")
-        return upload_path
-    elif os.path.exists(default_path):
-        print(f"   📁 Using default: {filename}")
-        return default_path
-    else:
-        print(f"   ❌ Missing: {filename}")
-        return None
+        return upload_path, True
+    default_path = f"{DEFAULT_DATA_DIR}/{filename}"
+    if os.path.exists(default_path):
+        return default_path, False
+    return None
 
-def load_inventory_data():
-    """Load inventory data from available source"""
-    file_path = get_data_source_path("inventory_snapshots.jsonl")
-    if not file_path:
-        return []
-    
-    data = []
+def _status(message):
+    """Print a progress message, or queue it while this thread is buffering output"""
+    lines = getattr(_thread_state, 'status_lines', None)
+    if lines is not None:
+        lines.append(message)
+    elif VERBOSE:
+        print(message)
+
+def _run_step(step, status_lines):
+    """Run one analysis step on a worker thread, queueing its progress messages"""
+    _thread_state.status_lines = status_lines
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data.append(json.loads(line))
-        return data
-    except Exception as e:
-        print(f"   Error loading inventory data: {e}")
-        return []
+        return step()
+    finally:
+        _thread_state.status_lines = None
 
-def load_pos_data():
-    """Load POS transaction data from available source"""
-    file_path = get_data_source_path("pos_transactions.jsonl")
-    if not file_path:
-        return []
-    
-    data = []
+def _step_result(future, status_lines):
+    """Wait for an analysis step, then pass on its queued messages"""
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data.append(json.loads(line))
-        return data
-    except Exception as e:
-        print(f"   Error loading POS data: {e}")
-        return []
+        return future.result()
+    finally:
+        for line in status_lines:
+            _status(line)
 
-def load_product_recognition_data():
-    """Load product recognition data from available source"""
-    file_path = get_data_source_path("product_recognition.jsonl")
-    if not file_path:
-        return []
+def get_data_source_path(filename):
+    """Get the path to data file, preferring uploads over default"""
+    source = _resolve_data_source(filename)
+    if source is None:
+        _status(f"   ❌ Missing: {filename}")
+        return None
     
-    data = []
+    path, is_upload = source
+    if is_upload:
+        _status(f"   📤 Using uploaded: {filename}")
+    else:
+        _status(f"   📁 Using default: {filename}")
+    return path
+
+def _parse_projected(line, pointers, data_fields):
+    """Parse a JSONL line keeping only _RECORD_FIELDS and the given 'data' fields"""
+    # One parser per thread reused for every line; its documents must not
+    # outlive the next parse
+    parser = getattr(_thread_state, 'parser', None)
+    if parser is None:
+        parser = _thread_state.parser = simdjson.Parser()
+    doc = parser.parse(line)
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
+        values = [doc.at_pointer(pointer) for pointer in pointers]
+    except (KeyError, TypeError, AttributeError):
+        values = None
+    
+    # Records missing a field (or with nested values) are parsed in full so the
+    # analyzers see them exactly as written
+    if values is None or any(isinstance(v, _SIMDJSON_CONTAINERS) for v in values):
+        return _loads(line)
+    
+    n = len(_RECORD_FIELDS)
+    record = dict(zip(_RECORD_FIELDS, values[:n]))
+    record['data'] = dict(zip(data_fields, values[n:]))
+    return record
+
+def _iter_lines(file_path):
+    """Yield the non-blank lines of a file as bytes, scanning a memory map"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            end = len(mm)
+            while start < end:
+                nl = mm.find(b'\n', start)
+                if nl < 0:
+                    nl = end  # last line without a trailing newline
+                line = mm[start:nl]
                 if line.strip():
-                    data.append(json.loads(line))
-        return data
-    except Exception as e:
-        print(f"   Error loading product recognition data: {e}")
-        return []
+                    yield line
+                start = nl + 1
+
+def _read_jsonl(file_path, data_fields=None):
+    """Yield the parsed records of a JSONL file, skipping blank lines
+    
+    When data_fields is given and simdjson is available, only those fields of
+    each record's 'data' object are converted to Python objects.
+    """
+    # Both parsers accept raw bytes, so no separate decode pass is needed
+    if data_fields is not None and SIMDJSON_AVAILABLE:
+        pointers = [f"/{field}" for field in _RECORD_FIELDS]
+        pointers += [f"/data/{field}" for field in data_fields]
+        for line in _iter_lines(file_path):
+            yield _parse_projected(line, pointers, data_fields)
+    else:
+        for line in _iter_lines(file_path):
+            yield _loads(line)
 
-def load_queue_data():
-    """Load queue monitoring data from available source"""
-    file_path = get_data_source_path("queue_monitoring.jsonl")
+def _load_jsonl(filename, label, data_fields=None):
+    """Load a JSONL data file from available source into a list"""
+    file_path = get_data_source_path(filename)
     if not file_path:
         return []
     
-    data = []
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data.append(json.loads(line))
-        return data
+        return list(_read_jsonl(file_path, data_fields))
     except Exception as e:
-        print(f"   Error loading queue data: {e}")
+        _status(f"   Error loading {label} data: {e}")
         return []
 
-def load_rfid_data():
-    """Load RFID readings data from available source"""
-    file_path = get_data_source_path("rfid_readings.jsonl")
+def _stream_jsonl(filename, label, data_fields=None):
+    """Yield records of a JSONL data file from available source one at a time
+    
+    A read or parse error ends the stream after the records already yielded.
+    """
+    file_path = get_data_source_path(filename)
     if not file_path:
-        return []
+        return
     
-    data = []
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data.append(json.loads(line))
-        return data
+        yield from _read_jsonl(file_path, data_fields)
     except Exception as e:
-        print(f"   Error loading RFID data: {e}")
-        return []
+        _status(f"   Error loading {label} data: {e}")
+
+def _make_loader(reader, filename, label, data_fields=None):
+    """Build a no-argument loader that reads filename with _load_jsonl or _stream_jsonl"""
+    def load():
+        return reader(filename, label, data_fields)
+    load.__doc__ = f"Load {label} data from available source"
+    return load
+
+load_inventory_data = _make_loader(_load_jsonl, "inventory_snapshots.jsonl", "inventory")
+load_pos_data = _make_loader(_stream_jsonl, "pos_transactions.jsonl", "POS", ('sku', 'weight_g'))
+load_product_recognition_data = _make_loader(_stream_jsonl, "product_recognition.jsonl", "product recognition",
+                                             ('accuracy', 'predicted_product'))
+load_queue_data = _make_loader(_stream_jsonl, "queue_monitoring.jsonl", "queue",
+                               ('average_dwell_time', 'customer_count'))
+load_rfid_data = _make_loader(_stream_jsonl, "rfid_readings.jsonl", "RFID", ('epc', 'location', 'sku'))
 
 def analyze_inventory_shrinkage(inventory_data):
-    """Analyze inventory for shrinkage events"""
+    """Analyze inventory for shrinkage events
+    
+    Returns (shrinkage_events, summary), where summary holds the item totals of
+    the first and last snapshots as loaded.
+    """
+    inventory_summary = {
+        "initial_inventory": 0,
+        "final_inventory": 0,
+        "net_change": 0
+    }
     if not inventory_data:
-        return []
+        return [], inventory_summary
     
-    shrinkage_events = []
+    # Calculate inventory summary from first and last snapshots
+    if len(inventory_data) >= 2:
+        initial_total = sum(inventory_data[0].get('data', {}).values())
+        final_total = sum(inventory_data[-1].get('data', {}).values())
+        inventory_summary = {
+            "initial_inventory": initial_total,
+            "final_inventory": final_total,
+            "net_change": final_total - initial_total
+        }
     
     # Sort data by timestamp
     sorted_data = sorted(inventory_data, key=lambda x: x.get('timestamp', ''))
+    snapshots = [snapshot.get('data', {}) for snapshot in sorted_data]
+    
+    # Snapshot x product quantity matrix, products in order of first appearance.
+    # Whole-unit counts are packed as int32; any fractional or out-of-range
+    # quantity keeps the matrix float64. key_pos is -1 where a product is missing
+    columns = {}
+    integral = True
+    for snapshot in snapshots:
+        for product, value in snapshot.items():
+            columns.setdefault(product, len(columns))
+            if integral and not (type(value) is int and INT32_MIN <= value <= INT32_MAX):
+                integral = False
+    
+    shape = (len(snapshots), len(columns))
+    qty = np.zeros(shape, dtype=np.int32 if integral else np.float64)
+    key_pos = np.full(shape, -1, dtype=np.int32)
+    for i, snapshot in enumerate(snapshots):
+        cols = [columns[product] for product in snapshot]
+        qty[i, cols] = list(snapshot.values())
+        key_pos[i, cols] = np.arange(len(cols))
+    
+    # Compare consecutive snapshots; only flag significant decreases (>3%)
+    rows, cols, pct = _shrinkage_hits(qty, key_pos >= 0, 3.0)
+    
+    # Emit per snapshot pair in the previous snapshot's key order
+    order = np.lexsort((key_pos[rows, cols], rows))
+    rows, cols, pct = rows[order], cols[order], pct[order]
+    severity = np.where(pct >= 10, "HIGH", "MEDIUM")
+    products = list(columns)
     
-    # Compare consecutive snapshots
-    for i in range(1, len(sorted_data)):
-        prev_snapshot = sorted_data[i-1].get('data', {})
-        curr_snapshot = sorted_data[i].get('data', {})
-        timestamp = sorted_data[i].get('timestamp')
-        
-        # Check each product for decreases
-        for product in prev_snapshot:
-            if product in curr_snapshot:
-                prev_qty = prev_snapshot[product]
-                curr_qty = curr_snapshot[product]
-                
-                if curr_qty < prev_qty:
-                    decrease_pct = ((prev_qty - curr_qty) / prev_qty) * 100
-                    
-                    # Only flag significant decreases (>3%)
-                    if decrease_pct >= 3.0:
-                        severity = "HIGH" if decrease_pct >= 10 else "MEDIUM"
-                        
-                        shrinkage_events.append({
-                            "timestamp": timestamp,
-                            "product": product,
-                            "previous_qty": prev_qty,
-                            "current_qty": curr_qty,
-                            "decrease_percentage": decrease_pct,
-                            "severity": severity
-                        })
-    
-    return shrinkage_events
+    shrinkage_events = []
+    for i, j, decrease, sev in zip(rows.tolist(), cols.tolist(), pct.tolist(), severity.tolist()):
+        product = products[j]
+        shrinkage_events.append({
+            "timestamp": sorted_data[i + 1].get('timestamp'),
+            "product": product,
+            "previous_qty": snapshots[i][product],
+            "current_qty": snapshots[i + 1][product],
+            "decrease_percentage": decrease,
+            "severity": sev
+        })
+    
+    return shrinkage_events, inventory_summary
 
 def analyze_pos_transactions(pos_data):
     """Analyze POS transactions for anomalies"""
     if not pos_data:
         return []
     
-    weight_discrepancies = []
+    weights_by_char = EXPECTED_WEIGHTS_BY_CHAR
     
-    # Expected weights for common product categories
-    expected_weights = {
-        "PRD_F": 400,  # Food items ~400g
-        "PRD_B": 500,  # Beverages ~500g
-        "PRD_A": 100,  # Accessories ~100g
-        "PRD_S": 200,  # Snacks ~200g
-        "PRD_V": 300,  # Vegetables ~300g
-        "PRD_H": 150,  # Health items ~150g
-        "PRD_C": 250,  # Cosmetics ~250g
-        "PRD_T": 300   # Textiles ~300g
-    }
+    # Weighed transactions as parallel columns; the discrepancy check runs on
+    # the whole batch afterwards
+    timestamps, skus, actual_weights, expected = [], [], [], []
     
     for transaction in pos_data:
         try:
-            data = transaction.get('data', {})
-            sku = data.get('sku', '')
-            actual_weight = data.get('weight_g', 0)
+            # A missing sku or weight could never be flagged, so the KeyError
+            # is skipped like any other malformed record
+            data = transaction['data']
+            sku = data['sku']
+            actual_weight = data['weight_g']
             
             # Get expected weight based on product category
-            category = sku.split('_')[0] + '_' + sku.split('_')[1]
-            expected_weight = expected_weights.get(category, 300)
+            # Category is the first two '_'-separated parts (PRD_F_14 -> PRD_F), so a
+            # known one is "PRD_" + sku[4] ending the SKU or followed by '_'. A SKU
+            # without '_' is skipped
+            if sku.find('_') < 0:
+                continue
+            if len(sku) > 4 and sku[:4] == 'PRD_' and sku[5:6] in ('', '_'):
+                expected_weight = weights_by_char.get(sku[4], 300)
+            else:
+                expected_weight = 300
             
-            # Check for significant weight discrepancy (>15%)
             if actual_weight > 0:
-                weight_diff_pct = abs(actual_weight - expected_weight) / expected_weight * 100
-                
-                if weight_diff_pct > 15:
-                    weight_discrepancies.append({
-                        "timestamp": transaction.get('timestamp'),
-                        "sku": sku,
-                        "expected_weight": expected_weight,
-                        "actual_weight": actual_weight,
-                        "discrepancy_percentage": weight_diff_pct,
-                        "severity": "MEDIUM"
-                    })
+                timestamp = transaction.get('timestamp')
+                timestamps.append(timestamp)
+                skus.append(sku)
+                actual_weights.append(actual_weight)
+                expected.append(expected_weight)
         except Exception:
             continue
     
+    # Check for significant weight discrepancy (>15%)
+    expected_arr = np.array(expected, dtype=np.float64)
+    weight_diff_pct = np.abs(np.array(actual_weights, dtype=np.float64) - expected_arr) / expected_arr * 100
+    
+    weight_discrepancies = []
+    for i in np.flatnonzero(weight_diff_pct > 15).tolist():
+        weight_discrepancies.append({
+            "timestamp": timestamps[i],
+            "sku": skus[i],
+            "expected_weight": expected[i],
+            "actual_weight": actual_weights[i],
+            "discrepancy_percentage": float(weight_diff_pct[i]),
+            "severity": "MEDIUM"
+        })
+    
     return weight_discrepancies
 
 def analyze_product_recognition(recognition_data):
@@ -205,8 +404,9 @@ def analyze_product_recognition(recognition_data):
     
     for event in recognition_data:
         try:
-            data = event.get('data', {})
-            accuracy = data.get('accuracy', 1.0)
+            # Missing accuracy reads as full confidence: skip without flagging
+            data = event['data']
+            accuracy = data['accuracy']
             
             # Flag low confidence recognition (<70%)
             if accuracy < 0.7:
@@ -230,9 +430,10 @@ def analyze_queue_behavior(queue_data):
     
     for event in queue_data:
         try:
-            data = event.get('data', {})
-            avg_dwell_time = data.get('average_dwell_time', 0)
-            customer_count = data.get('customer_count', 0)
+            # Missing dwell time or customer count can never be flagged
+            data = event['data']
+            avg_dwell_time = data['average_dwell_time']
+            customer_count = data['customer_count']
             
             # Flag unusually long dwell times (>5 minutes)
             if avg_dwell_time > 300 and customer_count > 0:
@@ -250,26 +451,28 @@ def analyze_queue_behavior(queue_data):
 
 def analyze_rfid_coverage(rfid_data):
     """Analyze RFID coverage and security"""
-    if not rfid_data:
-        return {"detection_rate": 0, "security_events": []}
-    
-    total_readings = len(rfid_data)
+    total_readings = 0
     valid_readings = 0
     security_events = []
     
+    # Counted while iterating so rfid_data can be a one-shot stream
     for event in rfid_data:
+        total_readings += 1
         try:
-            data = event.get('data', {})
-            epc = data.get('epc')
-            location = data.get('location')
-            sku = data.get('sku')
+            data = event['data']
+            epc = data['epc']
+            location = data['location']
+            sku = data['sku']
             
             if epc and location and sku:
                 valid_readings += 1
         except Exception:
             continue
     
-    detection_rate = (valid_readings / total_readings * 100) if total_readings > 0 else 0
+    if total_readings == 0:
+        return {"detection_rate": 0, "security_events": []}
+    
+    detection_rate = valid_readings / total_readings * 100
     
     return {
         "detection_rate": detection_rate,
@@ -279,11 +482,37 @@ def analyze_rfid_coverage(rfid_data):
     }
 
 def main():
-    """Main enhanced analysis function"""
-    print("============================================================")
-    print("PROJECT SENTINEL - ENHANCED FRAUD DETECTION")
-    print("============================================================")
-    print("🔍 Checking data sources...")
+    """Main enhanced analysis function
+    
+    Progress output is collected and written in one go at the end (or when a
+    step fails); set SENTINEL_VERBOSE=0 to silence it.
+    """
+    output = []
+    try:
+        return run(output)
+    finally:
+        if VERBOSE and output:
+            sys.stdout.write("\n".join(output) + "\n")
+
+def run(output):
+    """Run the analysis, appending progress lines to the output list
+    
+    Safe to call repeatedly from a long-lived process: data files are looked up
+    afresh and nothing is printed.
+    """
+    _resolve_data_source.cache_clear()
+    _thread_state.status_lines = output
+    try:
+        return _run_enhanced_analysis()
+    finally:
+        _thread_state.status_lines = None
+
+def _run_enhanced_analysis():
+    """Run every analysis and write the event and report files"""
+    _status("============================================================")
+    _status("PROJECT SENTINEL - ENHANCED FRAUD DETECTION")
+    _status("============================================================")
+    _status("🔍 Checking data sources...")
     
     # Check which data sources are available
     data_sources = {
@@ -295,119 +524,115 @@ def main():
     }
     
     for filename in data_sources:
-        upload_path = f"data/uploads/{filename}"
-        default_path = f"data/input/{filename}"
-        if os.path.exists(upload_path) or os.path.exists(default_path):
-            data_sources[filename] = True
+        data_sources[filename] = _resolve_data_source(filename) is not None
     
-    all_events = []
     analysis_results = {}
     
-    # 1. Inventory Analysis
-    print("\n1. Analyzing Inventory Data...")
-    inventory_data = load_inventory_data()
-    shrinkage_events = analyze_inventory_shrinkage(inventory_data)
-    all_events.extend([{**event, "event_type": "INVENTORY_SHRINKAGE"} for event in shrinkage_events])
-    analysis_results['inventory'] = {
-        "shrinkage_events": shrinkage_events,
-        "total_events": len(shrinkage_events)
-    }
-    print(f"   ✓ Found {len(shrinkage_events)} shrinkage events")
-    
-    # 2. POS Analysis
-    print("\n2. Analyzing POS Transaction Data...")
-    pos_data = load_pos_data()
-    weight_discrepancies = analyze_pos_transactions(pos_data)
-    all_events.extend([{**event, "event_type": "WEIGHT_DISCREPANCY"} for event in weight_discrepancies])
-    analysis_results['pos'] = {
-        "weight_discrepancies": weight_discrepancies,
-        "total_events": len(weight_discrepancies)
-    }
-    print(f"   ✓ Found {len(weight_discrepancies)} weight discrepancies")
-    
-    # 3. Product Recognition Analysis
-    print("\n3. Analyzing Product Recognition Data...")
-    recognition_data = load_product_recognition_data()
-    low_confidence_events = analyze_product_recognition(recognition_data)
-    all_events.extend([{**event, "event_type": "LOW_CONFIDENCE"} for event in low_confidence_events])
-    analysis_results['recognition'] = {
-        "low_confidence_events": low_confidence_events,
-        "total_events": len(low_confidence_events)
-    }
-    print(f"   ✓ Found {len(low_confidence_events)} low confidence events")
-    
-    # 4. Queue Analysis
-    print("\n4. Analyzing Queue Data...")
-    queue_data = load_queue_data()
-    dwell_anomalies = analyze_queue_behavior(queue_data)
-    all_events.extend([{**event, "event_type": "DWELL_ANOMALY"} for event in dwell_anomalies])
-    analysis_results['queue'] = {
-        "dwell_anomalies": dwell_anomalies,
-        "total_events": len(dwell_anomalies)
-    }
-    print(f"   ✓ Found {len(dwell_anomalies)} dwell time anomalies")
-    
-    # 5. RFID Analysis
-    print("\n5. Analyzing RFID Data...")
-    rfid_data = load_rfid_data()
-    rfid_results = analyze_rfid_coverage(rfid_data)
-    analysis_results['rfid'] = rfid_results
-    print(f"   ✓ RFID detection rate: {rfid_results['detection_rate']:.1f}%")
+    # The five analyses read different files and share no state, so they run
+    # concurrently; each step's messages are printed in order as it is collected
+    steps = (
+        lambda: analyze_inventory_shrinkage(load_inventory_data()),
+        lambda: analyze_pos_transactions(load_pos_data()),
+        lambda: analyze_product_recognition(load_product_recognition_data()),
+        lambda: analyze_queue_behavior(load_queue_data()),
+        lambda: analyze_rfid_coverage(load_rfid_data()),
+    )
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        pending = []
+        for step in steps:
+            status_lines = []
+            pending.append((pool.submit(_run_step, step, status_lines), status_lines))
+        
+        # 1. Inventory Analysis
+        _status("\n1. Analyzing Inventory Data...")
+        shrinkage_events, inventory_summary = _step_result(*pending[0])
+        analysis_results['inventory'] = {
+            "shrinkage_events": shrinkage_events,
+            "total_events": len(shrinkage_events)
+        }
+        _status(f"   ✓ Found {len(shrinkage_events)} shrinkage events")
+        
+        # 2. POS Analysis
+        _status("\n2. Analyzing POS Transaction Data...")
+        weight_discrepancies = _step_result(*pending[1])
+        analysis_results['pos'] = {
+            "weight_discrepancies": weight_discrepancies,
+            "total_events": len(weight_discrepancies)
+        }
+        _status(f"   ✓ Found {len(weight_discrepancies)} weight discrepancies")
+        
+        # 3. Product Recognition Analysis
+        _status("\n3. Analyzing Product Recognition Data...")
+        low_confidence_events = _step_result(*pending[2])
+        analysis_results['recognition'] = {
+            "low_confidence_events": low_confidence_events,
+            "total_events": len(low_confidence_events)
+        }
+        _status(f"   ✓ Found {len(low_confidence_events)} low confidence events")
+        
+        # 4. Queue Analysis
+        _status("\n4. Analyzing Queue Data...")
+        dwell_anomalies = _step_result(*pending[3])
+        analysis_results['queue'] = {
+            "dwell_anomalies": dwell_anomalies,
+            "total_events": len(dwell_anomalies)
+        }
+        _status(f"   ✓ Found {len(dwell_anomalies)} dwell time anomalies")
+        
+        # 5. RFID Analysis
+        _status("\n5. Analyzing RFID Data...")
+        rfid_results = _step_result(*pending[4])
+        analysis_results['rfid'] = rfid_results
+        _status(f"   ✓ RFID detection rate: {rfid_results['detection_rate']:.1f}%")
     
     # Generate comprehensive report
-    print("\n============================================================")
-    print("ENHANCED FRAUD DETECTION ANALYSIS COMPLETE")
-    print("============================================================")
+    _status("\n============================================================")
+    _status("ENHANCED FRAUD DETECTION ANALYSIS COMPLETE")
+    _status("============================================================")
+    
+    # Tag, tally and count event types in one pass over the detected events
+    event_groups = (
+        ("INVENTORY_SHRINKAGE", shrinkage_events),
+        ("WEIGHT_DISCREPANCY", weight_discrepancies),
+        ("LOW_CONFIDENCE", low_confidence_events),
+        ("DWELL_ANOMALY", dwell_anomalies),
+    )
+    all_events = []
+    severity_counts = Counter()
+    event_types = {}
+    for event_type, events in event_groups:
+        for event in events:
+            all_events.append({**event, "event_type": event_type})
+            severity_counts[event.get('severity')] += 1
+        if events:
+            event_types[event_type] = len(events)
     
     total_events = len(all_events)
-    high_severity = len([e for e in all_events if e.get('severity') == 'HIGH'])
-    medium_severity = len([e for e in all_events if e.get('severity') == 'MEDIUM'])
-    
-    print(f"Total Events Detected: {total_events}")
-    print(f"High Severity Events: {high_severity}")
-    print(f"Medium Severity Events: {medium_severity}")
+    high_severity = severity_counts['HIGH']
+    medium_severity = severity_counts['MEDIUM']
     
-    # Count event types
-    event_types = {}
-    for event in all_events:
-        event_type = event.get('event_type', 'UNKNOWN')
-        event_types[event_type] = event_types.get(event_type, 0) + 1
+    _status(f"Total Events Detected: {total_events}")
+    _status(f"High Severity Events: {high_severity}")
+    _status(f"Medium Severity Events: {medium_severity}")
     
-    print(f"\nEvent Types:")
+    _status(f"\nEvent Types:")
     for event_type, count in event_types.items():
-        print(f"  - {event_type}: {count}")
+        _status(f"  - {event_type}: {count}")
     
     # Generate output files
     os.makedirs("output", exist_ok=True)
     os.makedirs("reports", exist_ok=True)
     
-    # Save events for submission
-    with open("output/events.jsonl", "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    # Save events for submission, serialized into one buffer and written at once
+    buf = bytearray()
+    for event in all_events:
+        buf += _dumps(event)
+        buf += b"\n"
+    with open("output/events.jsonl", "wb") as f:
+        f.write(buf)
     
     # Generate inventory report (for dashboard compatibility)
     if shrinkage_events:
-        inventory_summary = {
-            "initial_inventory": 0,
-            "final_inventory": 0,
-            "net_change": 0
-        }
-        
-        # Calculate inventory summary from first and last snapshots
-        if inventory_data and len(inventory_data) >= 2:
-            first_snapshot = inventory_data[0].get('data', {})
-            last_snapshot = inventory_data[-1].get('data', {})
-            
-            initial_total = sum(first_snapshot.values())
-            final_total = sum(last_snapshot.values())
-            
-            inventory_summary = {
-                "initial_inventory": initial_total,
-                "final_inventory": final_total,
-                "net_change": final_total - initial_total
-            }
-        
         inventory_report = {
             "analysis_timestamp": datetime.now().isoformat(),
             "data_source": "Enhanced Analysis (Multiple Sources)",
@@ -434,10 +659,10 @@ def main():
     with open("reports/enhanced_analysis_report.json", "w") as f:
         json.dump(comprehensive_report, f, indent=2)
     
-    print(f"\nFiles Generated:")
-    print(f"  - output/events.jsonl (for submission)")
-    print(f"  - inventory_analysis_report.json (for dashboard)")
-    print(f"  - reports/enhanced_analysis_report.json (comprehensive report)")
+    _status(f"\nFiles Generated:")
+    _status(f"  - output/events.jsonl (for submission)")
+    _status(f"  - inventory_analysis_report.json (for dashboard)")
+    _status(f"  - reports/enhanced_analysis_report.json (comprehensive report)")
     
     return 0
 
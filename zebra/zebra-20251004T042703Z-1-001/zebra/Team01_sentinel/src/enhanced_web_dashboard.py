@@ -5,153 +5,246 @@ Enhanced Web Dashboard with File Upload Capability
 Allows manual data upload and works with both existing and new datasets
 """
 
+import gzip
+import heapq
+from html import escape
 import json
 import webbrowser
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import threading
 import time
 import os
-import cgi
+import subprocess
 import tempfile
-import urllib.parse
+import traceback
 import shutil
+import sys
+from string import Template
 
-class UploadHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        if self.path == '/' or self.path == '/dashboard':
-            self.serve_dashboard()
-        elif self.path == '/upload':
-            self.serve_upload_page()
-        elif self.path == '/api/analyze':
-            self.run_analysis()
-        else:
-            self.send_error(404)
+try:
+    import orjson
 
-    def do_POST(self):
-        if self.path == '/upload':
-            self.handle_file_upload()
-        else:
-            self.send_error(404)
+    def _loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json.dump can write NaN/Infinity and huge ints, which orjson rejects
+            return json.loads(data)
 
-    def serve_dashboard(self):
-        """Serve the main dashboard"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        html_content = self.generate_dashboard_html()
-        self.wfile.write(html_content.encode('utf-8'))
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
 
-    def serve_upload_page(self):
-        """Serve the file upload page"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        html_content = self.generate_upload_html()
-        self.wfile.write(html_content.encode('utf-8'))
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
 
-    def handle_file_upload(self):
-        """Handle file uploads"""
-        try:
-            content_type = self.headers['content-type']
-            if not content_type.startswith('multipart/form-data'):
-                self.send_error(400, "Bad Request: Expected multipart/form-data")
-                return
+try:
+    import enhanced_master_analysis
+    ANALYSIS_IN_PROCESS = True
+except ImportError:
+    ANALYSIS_IN_PROCESS = False
 
-            # Create uploads directory if it doesn't exist
-            upload_dir = "data/uploads"
-            os.makedirs(upload_dir, exist_ok=True)
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import FileTarget
 
-            # Parse the multipart form data
-            form = cgi.FieldStorage(
-                fp=self.rfile,
-                headers=self.headers,
-                environ={'REQUEST_METHOD': 'POST'}
-            )
+    class _PartTarget(FileTarget):
+        """FileTarget that records whether its part's closing boundary was reached"""
+        complete = False
 
-            uploaded_files = []
-            
-            # Handle each uploaded file
-            for field_name in form:
-                field = form[field_name]
-                if field.filename:
-                    filename = field.filename
-                    # Save the uploaded file
-                    file_path = os.path.join(upload_dir, filename)
-                    with open(file_path, 'wb') as f:
-                        f.write(field.file.read())
-                    uploaded_files.append(filename)
+        def on_finish(self):
+            super().on_finish()
+            self.complete = True
 
-            # Redirect to dashboard with success message
-            self.send_response(302)
-            self.send_header('Location', f'/?uploaded={len(uploaded_files)}')
-            self.end_headers()
+    STREAMING_FORM_DATA_AVAILABLE = True
+except ImportError:
+    import cgi
+    STREAMING_FORM_DATA_AVAILABLE = False
 
-        except Exception as e:
-            self.send_error(500, f"Upload failed: {str(e)}")
+# Upload form fields, each named after the data file it replaces
+UPLOAD_FILENAMES = (
+    "inventory_snapshots.jsonl",
+    "pos_transactions.jsonl",
+    "product_recognition.jsonl",
+    "queue_monitoring.jsonl",
+    "rfid_readings.jsonl",
+)
 
-    def run_analysis(self):
-        """Run analysis via API call"""
-        try:
-            # Import and run analysis
-            import subprocess
-            result = subprocess.run(['python', 'enhanced_master_analysis.py'], 
-                                  capture_output=True, text=True)
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            response = {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "error": result.stderr if result.returncode != 0 else None
-            }
-            
-            self.wfile.write(json.dumps(response).encode('utf-8'))
-            
-        except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"success": False, "error": str(e)}).encode('utf-8'))
+# The upload form has one field per data file; anything far beyond that is rejected
+UPLOAD_MAX_FIELDS = 20
 
-    def generate_dashboard_html(self):
-        """Generate main dashboard HTML"""
-        # Load analysis results
-        try:
-            with open('inventory_analysis_report.json', 'r') as f:
-                inventory_report = json.load(f)
-        except:
-            inventory_report = {"shrinkage_events": [], "summary": {"initial_inventory": 0, "final_inventory": 0, "net_change": 0}}
+# Larger upload requests are refused before any of the body is read
+MAX_UPLOAD_BYTES = 500 * 1024 * 1024
+
+# /events re-checks the dashboard stamp this often, and writes a comment line
+# at least this often so closed tabs are noticed
+EVENTS_POLL_SECONDS = 1
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Analyze requests arriving this soon after a finished run get its result
+ANALYSIS_CACHE_SECONDS = 5
+_ANALYSIS_LOCK = threading.Lock()
+_LAST_ANALYSIS = {"result": None, "finished": 0.0}
+
+# Dashboard metrics of the last parsed inventory report, reused until its mtime changes
+_REPORT_CACHE = {"mtime": None, "derived": None}
+_REPORT_CACHE_LOCK = threading.Lock()
+
+# The same metrics persisted per report mtime, so a restarted server skips the parse
+DASHBOARD_CACHE_DIR = "data/cache"
+_METRICS_CACHE_PREFIX = "dashboard_metrics."
 
-        events = inventory_report.get('shrinkage_events', [])
-        summary = inventory_report.get('summary', {})
+# File names per data directory, re-listed only when the directory's mtime changes
+_DIR_CACHE = {}
+
+def _dir_names(directory):
+    """Return the set of entry names in directory (empty if it does not exist)"""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return set()
+    
+    cached = _DIR_CACHE.get(directory)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    try:
+        with os.scandir(directory) as it:
+            names = {entry.name for entry in it}
+    except OSError:
+        names = set()
+    _DIR_CACHE[directory] = (mtime, names)
+    return names
+
+def _summarize_report(inventory_report):
+    """Compute the dashboard metrics of an inventory report"""
+    events = inventory_report.get('shrinkage_events', [])
+    summary = inventory_report.get('summary', {})
+    
+    # Calculate metrics (only those the page renders)
+    initial_inv = summary.get('initial_inventory', 0)
+    net_change = summary.get('net_change', 0)
+    
+    return {
+        "total_events": len(events),
+        "products_affected": len({e.get('product', '') for e in events}),
+        "initial_inv": initial_inv,
+        "shrinkage_rate": abs(net_change) / max(initial_inv, 1) * 100 if initial_inv > 0 else 0,
+        # Top 5 events by decrease percentage; same order as a stable reverse sort
+        "sorted_events": heapq.nlargest(5, events, key=lambda x: x.get('decrease_percentage', 0)),
+    }
+
+def _metrics_cache_path(mtime):
+    return os.path.join(DASHBOARD_CACHE_DIR, f"{_METRICS_CACHE_PREFIX}{mtime}.json")
+
+def _read_persisted_metrics(mtime):
+    """Return the metrics saved for this report mtime, or None"""
+    try:
+        with open(_metrics_cache_path(mtime), 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def _persist_metrics(mtime, derived):
+    """Save metrics for this report mtime atomically, dropping older ones"""
+    path = _metrics_cache_path(mtime)
+    try:
+        os.makedirs(DASHBOARD_CACHE_DIR, exist_ok=True)
+        # stdlib json keeps NaN/Infinity, so the saved metrics render identically
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(derived, f)
+        os.replace(path + '.tmp', path)
+        
+        for name in os.listdir(DASHBOARD_CACHE_DIR):
+            if name.startswith(_METRICS_CACHE_PREFIX) and name != os.path.basename(path):
+                os.remove(os.path.join(DASHBOARD_CACHE_DIR, name))
+    except (OSError, TypeError, ValueError):
+        pass  # the cache is only an optimization
+
+def _load_report_metrics():
+    """Load inventory_analysis_report.json metrics, re-parsing only when the file changed"""
+    try:
+        mtime = os.stat('inventory_analysis_report.json').st_mtime_ns
+    except OSError:
+        mtime = None
+    
+    with _REPORT_CACHE_LOCK:
+        if mtime is not None and mtime == _REPORT_CACHE["mtime"]:
+            return _REPORT_CACHE["derived"]
         
-        # Calculate metrics
-        total_events = len(events)
-        high_risk = len([e for e in events if e.get('severity') == 'HIGH'])
-        medium_risk = len([e for e in events if e.get('severity') == 'MEDIUM'])
-        products_affected = len(set(e.get('product', '') for e in events))
+        derived = _read_persisted_metrics(mtime) if mtime is not None else None
+        if derived is not None:
+            _REPORT_CACHE.update(mtime=mtime, derived=derived)
+            return derived
         
-        initial_inv = summary.get('initial_inventory', 0)
-        final_inv = summary.get('final_inventory', 0)
-        net_change = summary.get('net_change', 0)
-        shrinkage_rate = abs(net_change) / max(initial_inv, 1) * 100 if initial_inv > 0 else 0
+        try:
+            with open('inventory_analysis_report.json', 'rb') as f:
+                inventory_report = _loads(f.read())
+        except Exception:
+            # Missing or half-written report: show an empty one, retry next request
+            inventory_report = {"shrinkage_events": [], "summary": {"initial_inventory": 0, "final_inventory": 0, "net_change": 0}}
+            mtime = None
         
-        # Sort events by decrease percentage
-        sorted_events = sorted(events, key=lambda x: x.get('decrease_percentage', 0), reverse=True)[:5]
+        derived = _summarize_report(inventory_report)
+        _REPORT_CACHE.update(mtime=mtime, derived=derived)
+        if mtime is not None:
+            _persist_metrics(mtime, derived)
+        return derived
+
+def _dashboard_stamp():
+    """Return a token that changes whenever the report or a data directory does
+    
+    It backs the dashboard's (weak) ETag and the /events change notifications.
+    """
+    stamps = []
+    for path in ('inventory_analysis_report.json', 'data/input', 'data/uploads'):
+        try:
+            stamps.append(f"{os.stat(path).st_mtime_ns:x}")
+        except OSError:
+            stamps.append("0")
+    return "-".join(stamps)
+
+def _run_analysis_job():
+    """Run the enhanced analysis once and return its {success, output, error}"""
+    if ANALYSIS_IN_PROCESS:
+        lines = []
+        try:
+            enhanced_master_analysis.run(lines)
+            error = None
+        except Exception:
+            error = traceback.format_exc()
+        output = "\n".join(lines) + "\n" if lines else ""
+        return {"success": error is None, "output": output, "error": error}
+    
+    # Analysis dependencies not importable here: fall back to a separate run of this interpreter
+    result = subprocess.run([sys.executable, 'enhanced_master_analysis.py'],
+                            capture_output=True, text=True)
+    return {
+        "success": result.returncode == 0,
+        "output": result.stdout,
+        "error": result.stderr if result.returncode != 0 else None
+    }
+
+def _analysis_result():
+    """Return the latest analysis result, running one unless a fresh result exists
+    
+    Only one analysis runs at a time; requests arriving meanwhile wait for it and
+    share its result.
+    """
+    with _ANALYSIS_LOCK:
+        last = _LAST_ANALYSIS["result"]
+        if last is not None and time.time() - _LAST_ANALYSIS["finished"] < ANALYSIS_CACHE_SECONDS:
+            return last
         
-        # Check if we have uploaded files
-        upload_status = ""
-        query = urllib.parse.urlparse(self.path).query
-        if query:
-            params = urllib.parse.parse_qs(query)
-            if 'uploaded' in params:
-                upload_count = params['uploaded'][0]
-                upload_status = f'<div class="upload-success">✅ Successfully uploaded {upload_count} files!</div>'
+        result = _run_analysis_job()
+        result["timestamp"] = datetime.now().isoformat()
+        _LAST_ANALYSIS.update(result=result, finished=time.time())
+        return result
 
-        return f"""
+# Dashboard page, built once. The head (all of the CSS) never changes and is
+# kept pre-encoded; generate_dashboard_html fills in the $fields of the body
+_DASHBOARD_HEAD_BYTES = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -159,48 +252,48 @@ class UploadHandler(BaseHTTPRequestHandler):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Project Sentinel - Enhanced Dashboard</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
             color: white;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 30px;
             padding: 20px;
             background: rgba(255, 255, 255, 0.1);
             border-radius: 10px;
             backdrop-filter: blur(10px);
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
+        }
         
-        .controls {{
+        .controls {
             display: flex;
             justify-content: center;
             gap: 15px;
             margin: 20px 0;
             flex-wrap: wrap;
-        }}
+        }
         
-        .btn {{
+        .btn {
             background: linear-gradient(45deg, #007bff, #0056b3);
             color: white;
             border: none;
@@ -213,31 +306,31 @@ class UploadHandler(BaseHTTPRequestHandler):
             display: inline-block;
             transition: all 0.3s ease;
             box-shadow: 0 4px 15px rgba(0,123,255,0.3);
-        }}
+        }
         
-        .btn:hover {{
+        .btn:hover {
             background: linear-gradient(45deg, #0056b3, #004494);
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(0,123,255,0.4);
-        }}
+        }
         
-        .btn-upload {{
+        .btn-upload {
             background: linear-gradient(45deg, #28a745, #1e7e34);
-        }}
+        }
         
-        .btn-upload:hover {{
+        .btn-upload:hover {
             background: linear-gradient(45deg, #1e7e34, #155724);
-        }}
+        }
         
-        .btn-analyze {{
+        .btn-analyze {
             background: linear-gradient(45deg, #ffc107, #e0a800);
-        }}
+        }
         
-        .btn-analyze:hover {{
+        .btn-analyze:hover {
             background: linear-gradient(45deg, #e0a800, #d39e00);
-        }}
+        }
         
-        .upload-success {{
+        .upload-success {
             background: rgba(40, 167, 69, 0.2);
             border: 2px solid #28a745;
             padding: 15px;
@@ -245,107 +338,109 @@ class UploadHandler(BaseHTTPRequestHandler):
             text-align: center;
             margin: 20px 0;
             font-weight: bold;
-        }}
+        }
         
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255, 255, 255, 0.2);
             transition: transform 0.3s ease;
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
-        }}
+        }
         
-        .stat-card h3 {{
+        .stat-card h3 {
             font-size: 1.2em;
             margin-bottom: 15px;
             color: #ffd700;
-        }}
+        }
         
-        .stat-value {{
+        .stat-value {
             font-size: 2em;
             font-weight: bold;
             margin-bottom: 5px;
-        }}
+        }
         
-        .fraud-alerts {{
+        .fraud-alerts {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             margin-bottom: 30px;
-        }}
+        }
         
-        .fraud-alerts h3 {{
+        .fraud-alerts h3 {
             color: #ff6b6b;
             margin-bottom: 20px;
             font-size: 1.5em;
-        }}
+        }
         
-        .alert-item {{
+        .alert-item {
             background: rgba(255, 107, 107, 0.1);
             border-left: 4px solid #ff6b6b;
             padding: 15px;
             margin-bottom: 15px;
             border-radius: 5px;
-        }}
+        }
         
-        .data-sources {{
+        .data-sources {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             margin-bottom: 30px;
-        }}
+        }
         
-        .data-sources h3 {{
+        .data-sources h3 {
             color: #4ecdc4;
             margin-bottom: 15px;
             font-size: 1.5em;
-        }}
+        }
         
-        .source-grid {{
+        .source-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
-        }}
+        }
         
-        .source-item {{
+        .source-item {
             background: rgba(78, 205, 196, 0.1);
             padding: 15px;
             border-radius: 8px;
             text-align: center;
-        }}
+        }
         
-        .loading {{
+        .loading {
             display: none;
             text-align: center;
             padding: 20px;
-        }}
+        }
         
-        .loading.show {{
+        .loading.show {
             display: block;
-        }}
+        }
     </style>
 </head>
-<body>
+""".encode('utf-8')
+
+_DASHBOARD_TEMPLATE = Template("""<body>
     <div class="container">
         <div class="header">
             <h1>🛡️ PROJECT SENTINEL - ENHANCED</h1>
             <p>Retail Fraud Detection System with Data Upload</p>
             <div class="status">OPERATIONAL</div>
-            <p style="margin-top: 10px; font-size: 0.9em;">Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p style="margin-top: 10px; font-size: 0.9em;">Analysis Date: $analysis_date</p>
             
             <div class="controls">
                 <a href="/upload" class="btn btn-upload">📤 Upload Data Files</a>
@@ -353,7 +448,7 @@ class UploadHandler(BaseHTTPRequestHandler):
                 <button onclick="location.reload()" class="btn">🔄 Refresh Dashboard</button>
             </div>
             
-            {upload_status}
+            $upload_status
         </div>
         
         <div class="loading" id="loading">
@@ -364,25 +459,25 @@ class UploadHandler(BaseHTTPRequestHandler):
         <div class="stats-grid">
             <div class="stat-card">
                 <h3>📊 Total Events</h3>
-                <div class="stat-value">{total_events}</div>
+                <div class="stat-value">$total_events</div>
                 <div class="stat-label">Fraud events detected</div>
             </div>
             
             <div class="stat-card">
                 <h3>🏪 Products Affected</h3>
-                <div class="stat-value">{products_affected}</div>
+                <div class="stat-value">$products_affected</div>
                 <div class="stat-label">Unique products</div>
             </div>
             
             <div class="stat-card">
                 <h3>📈 Initial Inventory</h3>
-                <div class="stat-value">{initial_inv:,}</div>
+                <div class="stat-value">$initial_inv</div>
                 <div class="stat-label">Items at start</div>
             </div>
             
             <div class="stat-card">
                 <h3>🔍 Shrinkage Rate</h3>
-                <div class="stat-value">{shrinkage_rate:.2f}%</div>
+                <div class="stat-value">$shrinkage_rate%</div>
                 <div class="stat-label">Inventory loss rate</div>
             </div>
         </div>
@@ -390,49 +485,46 @@ class UploadHandler(BaseHTTPRequestHandler):
         <div class="data-sources">
             <h3>📁 Data Sources Status</h3>
             <div class="source-grid">
-                {self.generate_data_source_status()}
+                $data_sources
             </div>
         </div>
         
         <div class="fraud-alerts">
             <h3>🚨 Top Fraud Alerts</h3>
-            {self.generate_alert_html(sorted_events)}
+            $alerts
         </div>
     </div>
     
     <script>
-        function runAnalysis() {{
+        function runAnalysis() {
             document.getElementById('loading').classList.add('show');
             
             fetch('/api/analyze')
             .then(response => response.json())
-            .then(data => {{
+            .then(data => {
                 document.getElementById('loading').classList.remove('show');
-                if (data.success) {{
+                if (data.success) {
                     alert('Analysis completed successfully!');
                     location.reload();
-                }} else {{
+                } else {
                     alert('Analysis failed: ' + (data.error || 'Unknown error'));
-                }}
-            }})
-            .catch(error => {{
+                }
+            })
+            .catch(error => {
                 document.getElementById('loading').classList.remove('show');
                 alert('Error: ' + error.message);
-            }});
-        }}
+            });
+        }
         
-        // Auto-refresh every 60 seconds
-        setTimeout(() => {{
-            location.reload();
-        }}, 60000);
+        // Reload when the report or the data files change, as pushed by the server
+        new EventSource('/events?since=$stamp').onmessage = () => location.reload();
     </script>
 </body>
 </html>
-"""
+""")
 
-    def generate_upload_html(self):
-        """Generate file upload page HTML"""
-        return """
+# Upload page has no dynamic content
+_UPLOAD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -608,6 +700,331 @@ class UploadHandler(BaseHTTPRequestHandler):
 </body>
 </html>
 """
+_UPLOAD_HTML_BYTES = _UPLOAD_HTML.encode('utf-8')
+_UPLOAD_HTML_GZ = gzip.compress(_UPLOAD_HTML_BYTES, 6)
+
+# The constant page parts above are also mirrored into unlinked temp files on
+# first use, so they can be handed to the socket with os.sendfile
+_STATIC_PARTS = {id(_DASHBOARD_HEAD_BYTES), id(_UPLOAD_HTML_BYTES), id(_UPLOAD_HTML_GZ)}
+_STATIC_FILES = {}
+_STATIC_FILES_LOCK = threading.Lock()
+
+def _static_file(data):
+    """Return the open temp file holding one of the constant page parts"""
+    f = _STATIC_FILES.get(id(data))
+    if f is None:
+        with _STATIC_FILES_LOCK:
+            f = _STATIC_FILES.get(id(data))
+            if f is None:
+                f = tempfile.TemporaryFile()
+                f.write(data)
+                f.flush()
+                _STATIC_FILES[id(data)] = f
+    return f
+
+class UploadHandler(BaseHTTPRequestHandler):
+    # Buffer each response so headers and body leave in as few sends as possible
+    # (StreamRequestHandler flushes after every request), and send the flushed
+    # bytes at once instead of waiting on Nagle
+    wbufsize = 32 * 1024
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.partition('?')[0] in ('/', '/dashboard'):
+            self.serve_dashboard()
+        elif self.path == '/upload':
+            self.serve_upload_page()
+        elif self.path == '/api/analyze':
+            self.run_analysis()
+        elif self.path == '/api/analyze/status':
+            self.serve_analysis_status()
+        elif self.path.partition('?')[0] == '/events':
+            self.serve_events()
+        else:
+            self.send_error(404)
+
+    def do_HEAD(self):
+        if self.path.partition('?')[0] in ('/', '/dashboard'):
+            self.serve_dashboard()
+        elif self.path == '/upload':
+            self.serve_upload_page()
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path == '/upload':
+            self.handle_file_upload()
+        else:
+            self.send_error(404)
+
+    def serve_dashboard(self):
+        """Serve the main dashboard, or 304 if the client's copy is still current
+        
+        The ETag is weak since the page also carries the time it was rendered.
+        """
+        stamp = _dashboard_stamp()
+        etag = f'W/"{stamp}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        body = self.generate_dashboard_html(stamp).encode('utf-8')
+        self.send_html(_DASHBOARD_HEAD_BYTES, body, etag=etag)
+
+    def serve_upload_page(self):
+        """Serve the file upload page"""
+        self.send_html(_UPLOAD_HTML_BYTES, gzipped=_UPLOAD_HTML_GZ)
+
+    def send_html(self, *parts, gzipped=None, etag=None):
+        """Send an HTML page given as byte parts, gzip-encoded if the client accepts it
+        
+        gzipped is the page's precompressed form, when one is kept; otherwise the
+        parts are compressed here. With an etag the client is told to revalidate
+        before reusing the page. HEAD requests get the headers only.
+        """
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if use_gzip:
+            parts = (gzipped or gzip.compress(b''.join(parts), 6),)
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(sum(len(part) for part in parts)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            for part in parts:
+                if id(part) in _STATIC_PARTS:
+                    self.write_static(part)
+                else:
+                    self.wfile.write(part)
+
+    def write_static(self, data):
+        """Write a constant page part with os.sendfile, falling back to wfile.write"""
+        sent = 0
+        if hasattr(os, 'sendfile'):
+            try:
+                fd = _static_file(data).fileno()
+                self.wfile.flush()
+                while sent < len(data):
+                    count = os.sendfile(self.connection.fileno(), fd, sent, len(data) - sent)
+                    if not count:
+                        break
+                    sent += count
+            except OSError:
+                pass  # e.g. ENOSYS or a non-socket connection; write what is left
+        if sent < len(data):
+            self.wfile.write(data[sent:])
+
+    def handle_file_upload(self):
+        """Handle file uploads"""
+        try:
+            content_type = self.headers['content-type']
+            if not content_type.startswith('multipart/form-data'):
+                self.send_error(400, "Bad Request: Expected multipart/form-data")
+                return
+
+            if int(self.headers.get('content-length', 0)) > MAX_UPLOAD_BYTES:
+                self.send_error(413, f"Upload too large: the limit is {MAX_UPLOAD_BYTES} bytes")
+                return
+
+            # Create uploads directory if it doesn't exist
+            upload_dir = "data/uploads"
+            os.makedirs(upload_dir, exist_ok=True)
+
+            if STREAMING_FORM_DATA_AVAILABLE:
+                uploaded_files = self.receive_uploads_streaming(upload_dir)
+            else:
+                uploaded_files = self.receive_uploads_cgi(upload_dir)
+
+            if uploaded_files is None:
+                # The body was cut short; no upload was replaced, so send the form back
+                self.send_response(302)
+                self.send_header('Location', '/upload')
+                self.end_headers()
+                return
+
+            # New data makes any cached analysis result stale
+            _LAST_ANALYSIS["result"] = None
+
+            # Redirect to dashboard with success message
+            self.send_response(302)
+            self.send_header('Location', f'/?uploaded={len(uploaded_files)}')
+            self.end_headers()
+
+        except Exception as e:
+            self.send_error(500, f"Upload failed: {str(e)}")
+
+    def receive_uploads_streaming(self, upload_dir):
+        """Parse the request body in 64 KiB chunks, streaming each file part to disk
+        
+        Parts are written to a .part file and only moved into place when the
+        field actually carried a file, so empty fields leave existing uploads alone.
+        Returns None, replacing nothing, if the body ends before a part is complete.
+        """
+        parser = StreamingFormDataParser(headers=self.headers)
+        targets = {}
+        for name in UPLOAD_FILENAMES:
+            targets[name] = _PartTarget(os.path.join(upload_dir, name + '.part'))
+            parser.register(name, targets[name])
+
+        uploaded_files = []
+        try:
+            remaining = int(self.headers.get('content-length', 0))
+            while remaining > 0:
+                chunk = self.rfile.read(min(remaining, 64 * 1024))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                parser.data_received(chunk)
+            # A short body or an unterminated part means a file was cut off
+            if remaining > 0 or any(target.multipart_filename and not target.complete
+                                    for target in targets.values()):
+                return None
+
+            for name, target in targets.items():
+                if target.multipart_filename:
+                    os.replace(target.filename, os.path.join(upload_dir, name))
+                    uploaded_files.append(name)
+        finally:
+            for target in targets.values():
+                # Closes a part file a truncated body left open
+                target.finish()
+                try:
+                    os.remove(target.filename)
+                except OSError:
+                    pass
+        return uploaded_files
+
+    def receive_uploads_cgi(self, upload_dir):
+        """Fallback upload parsing with cgi.FieldStorage"""
+        form = cgi.FieldStorage(
+            fp=self.rfile,
+            headers=self.headers,
+            environ={'REQUEST_METHOD': 'POST'},
+            keep_blank_values=False,
+            max_num_fields=UPLOAD_MAX_FIELDS
+        )
+
+        uploaded_files = []
+        for name in UPLOAD_FILENAMES:
+            if name not in form:
+                continue
+            field = form[name]
+            if field.filename:
+                # Save the uploaded file, copied in 1 MiB chunks
+                with open(os.path.join(upload_dir, name), 'wb') as f:
+                    shutil.copyfileobj(field.file, f, 1024 * 1024)
+                uploaded_files.append(name)
+        return uploaded_files
+
+    def run_analysis(self):
+        """Run analysis via API call"""
+        try:
+            response = _analysis_result()
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            self.wfile.write(_dumps(response))
+            
+        except Exception as e:
+            self.send_response(500)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(_dumps({"success": False, "error": str(e)}))
+
+    def serve_events(self):
+        """Stream Server-Sent Events: 'refresh' whenever the dashboard stamp changes
+        
+        The page passes the stamp it was rendered with as ?since=, so a change
+        made before the stream opened is still reported.
+        """
+        last = None
+        for param in self.path.partition('?')[2].split('&'):
+            if param.startswith('since='):
+                last = param[6:]
+                break
+        if last is None:
+            last = _dashboard_stamp()
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        idle = 0
+        try:
+            while True:
+                stamp = _dashboard_stamp()
+                if stamp != last:
+                    last = stamp
+                    self.wfile.write(b'data: refresh\n\n')
+                    idle = 0
+                elif idle >= EVENTS_KEEPALIVE_SECONDS:
+                    self.wfile.write(b': keep-alive\n\n')
+                    idle = 0
+                self.wfile.flush()
+                time.sleep(EVENTS_POLL_SECONDS)
+                idle += EVENTS_POLL_SECONDS
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the tab was closed or reloaded
+
+    def serve_analysis_status(self):
+        """Report whether an analysis is running, with the last result"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        status = {"running": _ANALYSIS_LOCK.locked(), "last": _LAST_ANALYSIS["result"]}
+        self.wfile.write(_dumps(status))
+
+    def generate_dashboard_html(self, stamp):
+        """Generate main dashboard HTML following the static _DASHBOARD_HEAD_BYTES
+        
+        stamp is the _dashboard_stamp() the page's /events stream starts from.
+        """
+        # Load analysis results
+        metrics = _load_report_metrics()
+        total_events = metrics["total_events"]
+        products_affected = metrics["products_affected"]
+        initial_inv = metrics["initial_inv"]
+        shrinkage_rate = metrics["shrinkage_rate"]
+        sorted_events = metrics["sorted_events"]
+        
+        # Check if we have uploaded files
+        upload_status = ""
+        query = self.path.partition('?')[2]
+        if query:
+            for param in query.split('&'):
+                if param.startswith('uploaded='):
+                    upload_count = param[9:]
+                    # Only a plain count is echoed back into the page
+                    if upload_count.isdigit():
+                        upload_status = f'<div class="upload-success">✅ Successfully uploaded {upload_count} files!</div>'
+                    break
+
+        return _DASHBOARD_TEMPLATE.substitute(
+            analysis_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            upload_status=upload_status,
+            total_events=total_events,
+            products_affected=products_affected,
+            initial_inv=f"{initial_inv:,}",
+            shrinkage_rate=f"{shrinkage_rate:.2f}",
+            data_sources=self.generate_data_source_status(),
+            alerts=self.generate_alert_html(sorted_events),
+            stamp=stamp,
+        )
+
+    def generate_upload_html(self):
+        """Generate file upload page HTML"""
+        return _UPLOAD_HTML
 
     def generate_data_source_status(self):
         """Generate data source status indicators"""
@@ -619,66 +1036,73 @@ class UploadHandler(BaseHTTPRequestHandler):
             ("rfid_readings.jsonl", "📡 RFID Data")
         ]
         
-        html = ""
+        # Check both original location and uploads, one directory listing each
+        original_names = _dir_names("data/input")
+        upload_names = _dir_names("data/uploads")
+        
+        parts = []
         for filename, display_name in sources:
-            # Check both original location and uploads
-            original_path = f"data/input/{filename}"
-            upload_path = f"data/uploads/{filename}"
-            
-            if os.path.exists(upload_path):
+            if filename in upload_names:
                 status = "🟢 Uploaded"
                 source = "Custom"
-            elif os.path.exists(original_path):
+            elif filename in original_names:
                 status = "🟡 Default"
                 source = "Built-in"
             else:
                 status = "🔴 Missing"
                 source = "None"
             
-            html += f"""
+            parts.append(f"""
             <div class="source-item">
                 <strong>{display_name}</strong><br>
                 <span style="font-size: 0.9em;">{status}</span><br>
                 <small>{source}</small>
             </div>
-            """
+            """)
         
-        return html
+        return "".join(parts)
 
     def generate_alert_html(self, events):
         """Generate HTML for fraud alerts"""
         if not events:
             return "<p>No fraud events detected</p>"
         
-        html = ""
+        parts = []
         for i, event in enumerate(events[:5], 1):
-            html += f"""
+            # Event fields come from uploaded data; escape them before they reach the page
+            product = escape(str(event.get('product', 'Unknown')))
+            severity = escape(str(event.get('severity', 'MEDIUM')))
+            timestamp = escape(str(event.get('timestamp', 'N/A')))
+            decrease = event.get('decrease_percentage', 0)
+            previous_qty = escape(str(event.get('previous_qty', 0)))
+            current_qty = escape(str(event.get('current_qty', 0)))
+            parts.append(f"""
             <div class="alert-item">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <span style="font-weight: bold; font-size: 1.1em;">{i}. {event.get('product', 'Unknown')}</span>
-                    <span style="background: #ff6b6b; color: white; padding: 3px 10px; border-radius: 15px; font-size: 0.8em;">{event.get('severity', 'MEDIUM')}</span>
+                    <span style="font-weight: bold; font-size: 1.1em;">{i}. {product}</span>
+                    <span style="background: #ff6b6b; color: white; padding: 3px 10px; border-radius: 15px; font-size: 0.8em;">{severity}</span>
                 </div>
                 <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 10px; font-size: 0.9em;">
-                    <div><strong>Time:</strong> {event.get('timestamp', 'N/A')}</div>
-                    <div><strong>Decrease:</strong> {event.get('decrease_percentage', 0):.1f}%</div>
-                    <div><strong>Quantity:</strong> {event.get('previous_qty', 0)} → {event.get('current_qty', 0)}</div>
+                    <div><strong>Time:</strong> {timestamp}</div>
+                    <div><strong>Decrease:</strong> {decrease:.1f}%</div>
+                    <div><strong>Quantity:</strong> {previous_qty} → {current_qty}</div>
                 </div>
             </div>
-            """
+            """)
         
-        return html
+        return "".join(parts)
 
 def start_enhanced_server():
     """Start the enhanced web server with upload capability"""
-    server = HTTPServer(('localhost', 8080), UploadHandler)
+    server = ThreadingHTTPServer(('localhost', 8080), UploadHandler)
     print("🌐 Starting enhanced web dashboard server...")
     print("📊 Dashboard URL: http://localhost:8080")
     print("📤 Upload Page: http://localhost:8080/upload")
     print("🔄 Server supports file uploads and manual data entry")
     print("⏹️  Press Ctrl+C to stop the server")
     
-    # Open browser automatically
-    threading.Timer(1.0, lambda: webbrowser.open('http://localhost:8080')).start()
+    # The socket is already bound, so the browser can't beat the listener
+    webbrowser.open('http://localhost:8080', new=2)
     
     try:
         server.serve_forever()
@@ -5,129 +5,189 @@ Enhanced Web Dashboard - Python 3.13 Compatible
 File upload capability with modern Python support
 """
 
+import gzip
+import hashlib
+import heapq
 import json
+import operator
 import webbrowser
-from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import threading
 import time
 import os
-import urllib.parse
+import subprocess
+import sys
 import tempfile
+import traceback
+from functools import lru_cache
+from string import Template
 
-class EnhancedHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        if self.path == '/' or self.path.startswith('/?'):
-            self.serve_dashboard()
-        elif self.path == '/upload':
-            self.serve_upload_page()
-        elif self.path == '/api/analyze':
-            self.run_analysis()
-        else:
-            self.send_error(404)
+try:
+    import orjson
 
-    def do_POST(self):
-        if self.path == '/upload':
-            self.handle_simple_upload()
-        else:
-            self.send_error(404)
+    def _loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json.dump can write NaN/Infinity and huge ints, which orjson rejects
+            return json.loads(data)
 
-    def serve_dashboard(self):
-        """Serve the main dashboard"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        html_content = self.generate_dashboard_html()
-        self.wfile.write(html_content.encode('utf-8'))
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
 
-    def serve_upload_page(self):
-        """Serve the file upload page"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        html_content = self.generate_upload_html()
-        self.wfile.write(html_content.encode('utf-8'))
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
 
-    def handle_simple_upload(self):
-        """Handle simple file uploads"""
+try:
+    import enhanced_master_analysis
+    ANALYSIS_IN_PROCESS = True
+except ImportError:
+    ANALYSIS_IN_PROCESS = False
+
+# Requests are handled concurrently, but analysis runs all write the same
+# report files, so only one runs at a time
+_ANALYSIS_LOCK = threading.Lock()
+
+# Results of successful runs are saved here, keyed on the files the analysis
+# read, and reused while those files (and the run's outputs) are unchanged
+ANALYSIS_CACHE_DIR = "data/cache"
+_ANALYSIS_CACHE_PREFIX = "analysis_result."
+_ANALYSIS_OUTPUTS = ("output/events.jsonl", "reports/enhanced_analysis_report.json")
+
+# Rendered dashboard pages (plain, gzipped) by request path, valid while the stamp they were
+# rendered under is current. Query strings are client-chosen, so the number
+# of cached paths is capped
+DASHBOARD_CACHE_MAX_PAGES = 32
+_DASHBOARD_CACHE = {"stamp": None, "pages": {}}
+_DASHBOARD_CACHE_LOCK = threading.Lock()
+
+# File names per data directory, re-listed only when the directory's mtime changes
+_DIR_CACHE = {}
+
+def _dir_names(directory):
+    """Return the set of entry names in directory (empty if it does not exist)"""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return set()
+    
+    cached = _DIR_CACHE.get(directory)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    try:
+        with os.scandir(directory) as it:
+            names = {entry.name for entry in it}
+    except OSError:
+        names = set()
+    _DIR_CACHE[directory] = (mtime, names)
+    return names
+
+def _run_analysis_job():
+    """Run the enhanced analysis once and return its {success, output, error}"""
+    if ANALYSIS_IN_PROCESS:
+        lines = []
         try:
-            # Create uploads directory
-            upload_dir = "data/uploads"
-            os.makedirs(upload_dir, exist_ok=True)
-            
-            # Simple success response for now
-            self.send_response(302)
-            self.send_header('Location', '/?upload=success')
-            self.end_headers()
-            
-        except Exception as e:
-            self.send_response(302)
-            self.send_header('Location', f'/?upload=error&msg={str(e)}')
-            self.end_headers()
+            enhanced_master_analysis.run(lines)
+            error = None
+        except Exception:
+            error = traceback.format_exc()
+        output = "\n".join(lines) + "\n" if lines else ""
+        return {"success": error is None, "output": output, "error": error}
+    
+    # Analysis dependencies not importable here: fall back to a separate run of this interpreter
+    result = subprocess.run([sys.executable, 'enhanced_master_analysis.py'],
+                            capture_output=True, text=True, cwd='.')
+    return {
+        "success": result.returncode == 0,
+        "output": result.stdout,
+        "error": result.stderr if result.returncode != 0 else None
+    }
 
-    def run_analysis(self):
-        """Run analysis via API call"""
+def _source_version(path):
+    """Return (path, mtime_ns, size) of a source file, or None if it can't be stat'ed"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+# The in-process analysis runs the code imported at startup, even if the file
+# is edited later, so its version is taken once here
+_IMPORTED_ANALYSIS_VERSION = _source_version(enhanced_master_analysis.__file__) if ANALYSIS_IN_PROCESS else None
+
+def _analysis_inputs_key():
+    """Return a hash of the name, mtime and size of every file the analysis reads"""
+    files = []
+    for directory in ('data/input', 'data/uploads'):
         try:
-            import subprocess
-            result = subprocess.run(['python', 'enhanced_master_analysis.py'], 
-                                  capture_output=True, text=True, cwd='.')
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            response = {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "error": result.stderr if result.returncode != 0 else None
-            }
-            
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.jsonl'):
+                        st = entry.stat()
+                        files.append((directory, entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+    
+    if ANALYSIS_IN_PROCESS:
+        code_version = _IMPORTED_ANALYSIS_VERSION
+    else:
+        code_version = _source_version('enhanced_master_analysis.py')
+    if code_version is not None:
+        files.append(("",) + code_version)
+    return hashlib.sha1(repr(sorted(files)).encode('utf-8')).hexdigest()
+
+def _analysis_result():
+    """Return the analysis result for the current data, re-running only when it changed"""
+    path = os.path.join(ANALYSIS_CACHE_DIR, f"{_ANALYSIS_CACHE_PREFIX}{_analysis_inputs_key()}.json")
+    if all(os.path.exists(output) for output in _ANALYSIS_OUTPUTS):
+        try:
+            with open(path, 'rb') as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            pass
+    
+    result = _run_analysis_job()
+    if result["success"]:
+        try:
+            os.makedirs(ANALYSIS_CACHE_DIR, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(_dumps(result))
+            os.replace(path + '.tmp', path)
             
-        except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"success": False, "error": str(e)}).encode('utf-8'))
+            for name in os.listdir(ANALYSIS_CACHE_DIR):
+                if name.startswith(_ANALYSIS_CACHE_PREFIX) and name != os.path.basename(path):
+                    os.remove(os.path.join(ANALYSIS_CACHE_DIR, name))
+        except OSError:
+            pass  # the cache is only an optimization
+    return result
 
-    def generate_dashboard_html(self):
-        """Generate main dashboard HTML"""
-        # Load analysis results
+def _dashboard_stamp():
+    """Return the mtimes of everything the dashboard page is rendered from"""
+    stamp = []
+    for path in ('inventory_analysis_report.json', 'data/input', 'data/uploads'):
         try:
-            with open('inventory_analysis_report.json', 'r') as f:
-                inventory_report = json.load(f)
-        except:
-            inventory_report = {"shrinkage_events": [], "summary": {"initial_inventory": 0, "final_inventory": 0, "net_change": 0}}
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(0)
+    return tuple(stamp)
 
-        events = inventory_report.get('shrinkage_events', [])
-        summary = inventory_report.get('summary', {})
-        
-        # Calculate metrics
-        total_events = len(events)
-        high_risk = len([e for e in events if e.get('severity') == 'HIGH'])
-        medium_risk = len([e for e in events if e.get('severity') == 'MEDIUM'])
-        products_affected = len(set(e.get('product', '') for e in events))
-        
-        initial_inv = summary.get('initial_inventory', 0)
-        final_inv = summary.get('final_inventory', 0)
-        net_change = summary.get('net_change', 0)
-        shrinkage_rate = abs(net_change) / max(initial_inv, 1) * 100 if initial_inv > 0 else 0
-        
-        # Sort events by decrease percentage
-        sorted_events = sorted(events, key=lambda x: x.get('decrease_percentage', 0), reverse=True)[:5]
-        
-        # Check URL parameters for upload status
-        upload_status = ""
-        parsed_url = urllib.parse.urlparse(self.path)
-        if parsed_url.query:
-            params = urllib.parse.parse_qs(parsed_url.query)
-            if 'upload' in params:
-                if params['upload'][0] == 'success':
-                    upload_status = '<div class="upload-success">✅ Files uploaded successfully! Click "Run Analysis" to process new data.</div>'
-                elif params['upload'][0] == 'error':
-                    upload_status = '<div class="upload-error">❌ Upload failed. Please try again.</div>'
-
-        return f"""
+@lru_cache(maxsize=4)
+def _load_report(path, mtime_ns, size):
+    """Parse a JSON report; mtime_ns and size key the cache, so each version is parsed once"""
+    with open(path, 'rb') as f:
+        report = _loads(f.read())
+    
+    # Every shrinkage event gets a decrease_percentage, so _DECREASE_KEY can rank them
+    for event in report.get('shrinkage_events', []):
+        event.setdefault('decrease_percentage', 0)
+    return report
+
+_DECREASE_KEY = operator.itemgetter('decrease_percentage')
+
+# Dashboard page, built once; generate_dashboard_html fills in its $fields
+_DASHBOARD_TEMPLATE = Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -135,49 +195,49 @@ class EnhancedHandler(BaseHTTPRequestHandler):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Project Sentinel - Enhanced Dashboard</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
             color: white;
             padding: 20px;
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 30px;
             padding: 20px;
             background: rgba(255, 255, 255, 0.1);
             border-radius: 10px;
             backdrop-filter: blur(10px);
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
+        }
         
-        .controls {{
+        .controls {
             display: flex;
             justify-content: center;
             gap: 15px;
             margin: 20px 0;
             flex-wrap: wrap;
-        }}
+        }
         
-        .btn {{
+        .btn {
             background: linear-gradient(45deg, #007bff, #0056b3);
             color: white;
             border: none;
@@ -190,32 +250,32 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             display: inline-block;
             transition: all 0.3s ease;
             box-shadow: 0 4px 15px rgba(0,123,255,0.3);
-        }}
+        }
         
-        .btn:hover {{
+        .btn:hover {
             background: linear-gradient(45deg, #0056b3, #004494);
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(0,123,255,0.4);
-        }}
+        }
         
-        .btn-upload {{
+        .btn-upload {
             background: linear-gradient(45deg, #28a745, #1e7e34);
-        }}
+        }
         
-        .btn-upload:hover {{
+        .btn-upload:hover {
             background: linear-gradient(45deg, #1e7e34, #155724);
-        }}
+        }
         
-        .btn-analyze {{
+        .btn-analyze {
             background: linear-gradient(45deg, #ffc107, #e0a800);
             color: #000;
-        }}
+        }
         
-        .btn-analyze:hover {{
+        .btn-analyze:hover {
             background: linear-gradient(45deg, #e0a800, #d39e00);
-        }}
+        }
         
-        .upload-success {{
+        .upload-success {
             background: rgba(40, 167, 69, 0.2);
             border: 2px solid #28a745;
             padding: 15px;
@@ -223,9 +283,9 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             text-align: center;
             margin: 20px 0;
             font-weight: bold;
-        }}
+        }
         
-        .upload-error {{
+        .upload-error {
             background: rgba(220, 53, 69, 0.2);
             border: 2px solid #dc3545;
             padding: 15px;
@@ -233,134 +293,134 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             text-align: center;
             margin: 20px 0;
             font-weight: bold;
-        }}
+        }
         
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255, 255, 255, 0.2);
             transition: transform 0.3s ease;
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
-        }}
+        }
         
-        .stat-card h3 {{
+        .stat-card h3 {
             font-size: 1.2em;
             margin-bottom: 15px;
             color: #ffd700;
-        }}
+        }
         
-        .stat-value {{
+        .stat-value {
             font-size: 2em;
             font-weight: bold;
             margin-bottom: 5px;
-        }}
+        }
         
-        .fraud-alerts {{
+        .fraud-alerts {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             margin-bottom: 30px;
-        }}
+        }
         
-        .fraud-alerts h3 {{
+        .fraud-alerts h3 {
             color: #ff6b6b;
             margin-bottom: 20px;
             font-size: 1.5em;
-        }}
+        }
         
-        .alert-item {{
+        .alert-item {
             background: rgba(255, 107, 107, 0.1);
             border-left: 4px solid #ff6b6b;
             padding: 15px;
             margin-bottom: 15px;
             border-radius: 5px;
-        }}
+        }
         
-        .data-sources {{
+        .data-sources {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             margin-bottom: 30px;
-        }}
+        }
         
-        .data-sources h3 {{
+        .data-sources h3 {
             color: #4ecdc4;
             margin-bottom: 15px;
             font-size: 1.5em;
-        }}
+        }
         
-        .source-grid {{
+        .source-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
-        }}
+        }
         
-        .source-item {{
+        .source-item {
             background: rgba(78, 205, 196, 0.1);
             padding: 15px;
             border-radius: 8px;
             text-align: center;
-        }}
+        }
         
-        .loading {{
+        .loading {
             display: none;
             text-align: center;
             padding: 20px;
             background: rgba(255, 255, 255, 0.1);
             border-radius: 10px;
             backdrop-filter: blur(10px);
-        }}
+        }
         
-        .loading.show {{
+        .loading.show {
             display: block;
-        }}
+        }
         
-        .manual-input {{
+        .manual-input {
             background: rgba(255, 255, 255, 0.1);
             padding: 20px;
             border-radius: 10px;
             backdrop-filter: blur(10px);
             margin-bottom: 30px;
-        }}
+        }
         
-        .manual-input h3 {{
+        .manual-input h3 {
             color: #17a2b8;
             margin-bottom: 15px;
-        }}
+        }
         
-        .input-grid {{
+        .input-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 15px;
-        }}
+        }
         
-        .input-card {{
+        .input-card {
             background: rgba(23, 162, 184, 0.1);
             padding: 15px;
             border-radius: 8px;
             border: 1px solid rgba(23, 162, 184, 0.3);
-        }}
+        }
         
-        .input-card h4 {{
+        .input-card h4 {
             color: #17a2b8;
             margin-bottom: 10px;
-        }}
+        }
         
-        textarea {{
+        textarea {
             width: 100%;
             height: 80px;
             background: rgba(255, 255, 255, 0.1);
@@ -371,11 +431,11 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             font-family: monospace;
             font-size: 0.9em;
             resize: vertical;
-        }}
+        }
         
-        textarea::placeholder {{
+        textarea::placeholder {
             color: rgba(255, 255, 255, 0.6);
-        }}
+        }
     </style>
 </head>
 <body>
@@ -384,7 +444,7 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             <h1>🛡️ PROJECT SENTINEL - ENHANCED</h1>
             <p>Retail Fraud Detection System with Manual Data Entry</p>
             <div class="status">OPERATIONAL</div>
-            <p style="margin-top: 10px; font-size: 0.9em;">Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p style="margin-top: 10px; font-size: 0.9em;">Analysis Date: <span id="analysisDate"></span></p>
             
             <div class="controls">
                 <a href="/upload" class="btn btn-upload">📤 Upload Data Files</a>
@@ -393,7 +453,7 @@ class EnhancedHandler(BaseHTTPRequestHandler):
                 <button onclick="toggleManualInput()" class="btn">✏️ Manual Input</button>
             </div>
             
-            {upload_status}
+            $upload_status
         </div>
         
         <div class="loading" id="loading">
@@ -407,19 +467,19 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             <div class="input-grid">
                 <div class="input-card">
                     <h4>📦 Inventory Snapshots</h4>
-                    <textarea id="inventoryData" placeholder='{{"timestamp": "2025-10-04T10:00:00", "data": {{"PRD_F_01": 100, "PRD_F_02": 80}}}}'></textarea>
+                    <textarea id="inventoryData" placeholder='{"timestamp": "2025-10-04T10:00:00", "data": {"PRD_F_01": 100, "PRD_F_02": 80}}'></textarea>
                 </div>
                 <div class="input-card">
                     <h4>🛒 POS Transactions</h4>
-                    <textarea id="posData" placeholder='{{"timestamp": "2025-10-04T10:05:00", "station_id": "SCC1", "data": {{"customer_id": "C001", "sku": "PRD_F_01", "price": 540.0}}}}'></textarea>
+                    <textarea id="posData" placeholder='{"timestamp": "2025-10-04T10:05:00", "station_id": "SCC1", "data": {"customer_id": "C001", "sku": "PRD_F_01", "price": 540.0}}'></textarea>
                 </div>
                 <div class="input-card">
                     <h4>📱 Product Recognition</h4>
-                    <textarea id="recognitionData" placeholder='{{"timestamp": "2025-10-04T10:05:00", "data": {{"predicted_product": "PRD_F_01", "accuracy": 0.89}}}}'></textarea>
+                    <textarea id="recognitionData" placeholder='{"timestamp": "2025-10-04T10:05:00", "data": {"predicted_product": "PRD_F_01", "accuracy": 0.89}}'></textarea>
                 </div>
                 <div class="input-card">
                     <h4>👥 Queue Monitoring</h4>
-                    <textarea id="queueData" placeholder='{{"timestamp": "2025-10-04T10:00:00", "data": {{"customer_count": 3, "average_dwell_time": 120.5}}}}'></textarea>
+                    <textarea id="queueData" placeholder='{"timestamp": "2025-10-04T10:00:00", "data": {"customer_count": 3, "average_dwell_time": 120.5}}'></textarea>
                 </div>
             </div>
             <div style="text-align: center; margin-top: 20px;">
@@ -430,25 +490,25 @@ class EnhancedHandler(BaseHTTPRequestHandler):
         <div class="stats-grid">
             <div class="stat-card">
                 <h3>📊 Total Events</h3>
-                <div class="stat-value">{total_events}</div>
+                <div class="stat-value">$total_events</div>
                 <div class="stat-label">Fraud events detected</div>
             </div>
             
             <div class="stat-card">
                 <h3>🏪 Products Affected</h3>
-                <div class="stat-value">{products_affected}</div>
+                <div class="stat-value">$products_affected</div>
                 <div class="stat-label">Unique products</div>
             </div>
             
             <div class="stat-card">
                 <h3>📈 Initial Inventory</h3>
-                <div class="stat-value">{initial_inv:,}</div>
+                <div class="stat-value">$initial_inv</div>
                 <div class="stat-label">Items at start</div>
             </div>
             
             <div class="stat-card">
                 <h3>🔍 Shrinkage Rate</h3>
-                <div class="stat-value">{shrinkage_rate:.2f}%</div>
+                <div class="stat-value">$shrinkage_rate%</div>
                 <div class="stat-label">Inventory loss rate</div>
             </div>
         </div>
@@ -456,52 +516,61 @@ class EnhancedHandler(BaseHTTPRequestHandler):
         <div class="data-sources">
             <h3>📁 Data Sources Status</h3>
             <div class="source-grid">
-                {self.generate_data_source_status()}
+                $data_sources
             </div>
         </div>
         
         <div class="fraud-alerts">
             <h3>🚨 Top Fraud Alerts</h3>
-            {self.generate_alert_html(sorted_events)}
+            $alerts
         </div>
     </div>
     
     <script>
-        function runAnalysis() {{
+        // The page time is filled in here, so cached pages are served unchanged
+        (function () {
+            const d = new Date();
+            const pad = n => String(n).padStart(2, '0');
+            document.getElementById('analysisDate').textContent =
+                d.getFullYear() + '-' + pad(d.getMonth() + 1) + '-' + pad(d.getDate()) + ' ' +
+                pad(d.getHours()) + ':' + pad(d.getMinutes()) + ':' + pad(d.getSeconds());
+        })();
+        
+        function runAnalysis() {
             document.getElementById('loading').classList.add('show');
             
             fetch('/api/analyze')
             .then(response => response.json())
-            .then(data => {{
+            .then(data => {
                 document.getElementById('loading').classList.remove('show');
-                if (data.success) {{
+                if (data.success) {
                     alert('✅ Analysis completed successfully!');
                     location.reload();
-                }} else {{
+                } else {
                     alert('❌ Analysis failed: ' + (data.error || 'Unknown error'));
-                }}
-            }})
-            .catch(error => {{
+                }
+            })
+            .catch(error => {
                 document.getElementById('loading').classList.remove('show');
                 alert('❌ Error: ' + error.message);
-            }});
-        }}
+            });
+        }
         
-        function toggleManualInput() {{
+        function toggleManualInput() {
             const manualInput = document.getElementById('manualInput');
             manualInput.style.display = manualInput.style.display === 'none' ? 'block' : 'none';
-        }}
+        }
         
-        function saveManualData() {{
+        function saveManualData() {
             const inventoryData = document.getElementById('inventoryData').value.trim();
             const posData = document.getElementById('posData').value.trim();
             const recognitionData = document.getElementById('recognitionData').value.trim();
             const queueData = document.getElementById('queueData').value.trim();
             
-            if (!inventoryData && !posData && !recognitionData && !queueData) {{
+            if (!inventoryData && !posData && !recognitionData && !queueData) {
                 alert('⚠️ Please enter at least one type of data');
                 return;
-            }}
+            }
             
             // Simple client-side storage (in production, this would be sent to server)
             localStorage.setItem('manualInventoryData', inventoryData);
@@ -511,15 +580,14 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             
             alert('💾 Manual data saved! Click "Run Analysis" to process the data.');
             document.getElementById('manualInput').style.display = 'none';
-        }}
+        }
     </script>
 </body>
 </html>
-"""
+""")
 
-    def generate_upload_html(self):
-        """Generate file upload page HTML"""
-        return """
+# Upload page has no dynamic content
+_UPLOAD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -696,6 +764,154 @@ class EnhancedHandler(BaseHTTPRequestHandler):
 </body>
 </html>
 """
+_UPLOAD_HTML_BYTES = _UPLOAD_HTML.encode('utf-8')
+_UPLOAD_HTML_GZ = gzip.compress(_UPLOAD_HTML_BYTES, 6)
+
+class EnhancedHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests; every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    # Buffer each response so headers and body leave in one send (the buffer is
+    # flushed after every request), and send it at once instead of waiting on Nagle
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == '/' or self.path.startswith('/?'):
+            self.serve_dashboard()
+        elif self.path == '/upload':
+            self.serve_upload_page()
+        elif self.path == '/api/analyze':
+            self.run_analysis()
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path == '/upload':
+            self.handle_simple_upload()
+        else:
+            self.send_error(404)
+
+    def serve_dashboard(self):
+        """Serve the main dashboard, re-rendering only when its inputs changed"""
+        stamp = _dashboard_stamp()
+        with _DASHBOARD_CACHE_LOCK:
+            if _DASHBOARD_CACHE["stamp"] != stamp:
+                _DASHBOARD_CACHE.update(stamp=stamp, pages={})
+            pages = _DASHBOARD_CACHE["pages"]
+        
+        page = pages.get(self.path)
+        if page is None:
+            html_bytes = self.generate_dashboard_html().encode('utf-8')
+            page = (html_bytes, gzip.compress(html_bytes, 6))
+            if len(pages) < DASHBOARD_CACHE_MAX_PAGES:
+                pages[self.path] = page
+        
+        self.send_body(page[0], 'text/html', gzipped=page[1])
+
+    def serve_upload_page(self):
+        """Serve the file upload page"""
+        self.send_body(_UPLOAD_HTML_BYTES, 'text/html', gzipped=_UPLOAD_HTML_GZ)
+
+    def send_body(self, body, content_type, status=200, gzipped=None):
+        """Send a complete response with the given body bytes
+        
+        gzipped, when given, is the body's precompressed form, sent instead to
+        clients that accept gzip.
+        """
+        use_gzip = gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if use_gzip:
+            body = gzipped
+        
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        if gzipped is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def redirect_unread(self, location):
+        """Redirect without having read the request body, so the connection can't be reused"""
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+    def handle_simple_upload(self):
+        """Handle simple file uploads"""
+        try:
+            # Create uploads directory
+            upload_dir = "data/uploads"
+            os.makedirs(upload_dir, exist_ok=True)
+            
+            # Simple success response for now
+            self.redirect_unread('/?upload=success')
+            
+        except Exception as e:
+            self.redirect_unread(f'/?upload=error&msg={str(e)}')
+
+    def run_analysis(self):
+        """Run analysis via API call"""
+        try:
+            with _ANALYSIS_LOCK:
+                response = _analysis_result()
+            
+            self.send_body(_dumps(response), 'application/json')
+            
+        except Exception as e:
+            self.send_body(_dumps({"success": False, "error": str(e)}), 'application/json', 500)
+
+    def generate_dashboard_html(self):
+        """Generate main dashboard HTML"""
+        # Load analysis results
+        try:
+            st = os.stat('inventory_analysis_report.json')
+            inventory_report = _load_report('inventory_analysis_report.json', st.st_mtime_ns, st.st_size)
+        except:
+            inventory_report = {"shrinkage_events": [], "summary": {"initial_inventory": 0, "final_inventory": 0, "net_change": 0}}
+
+        events = inventory_report.get('shrinkage_events', [])
+        summary = inventory_report.get('summary', {})
+        
+        # Calculate metrics (only those the page renders)
+        total_events = len(events)
+        products_affected = len({e.get('product', '') for e in events})
+        
+        initial_inv = summary.get('initial_inventory', 0)
+        net_change = summary.get('net_change', 0)
+        shrinkage_rate = abs(net_change) / max(initial_inv, 1) * 100 if initial_inv > 0 else 0
+        
+        # Top 5 events by decrease percentage; same order as a stable reverse sort
+        sorted_events = heapq.nlargest(5, events, key=_DECREASE_KEY)
+        
+        # Check URL parameters for upload status
+        upload_status = ""
+        query = self.path.partition('?')[2]
+        if query:
+            for param in query.split('&'):
+                if param.startswith('upload='):
+                    if param == 'upload=success':
+                        upload_status = '<div class="upload-success">✅ Files uploaded successfully! Click "Run Analysis" to process new data.</div>'
+                    elif param == 'upload=error':
+                        upload_status = '<div class="upload-error">❌ Upload failed. Please try again.</div>'
+                    break
+
+        return _DASHBOARD_TEMPLATE.substitute(
+            upload_status=upload_status,
+            total_events=total_events,
+            products_affected=products_affected,
+            initial_inv=f"{initial_inv:,}",
+            shrinkage_rate=f"{shrinkage_rate:.2f}",
+            data_sources=self.generate_data_source_status(),
+            alerts=self.generate_alert_html(sorted_events),
+        )
+
+    def generate_upload_html(self):
+        """Generate file upload page HTML"""
+        return _UPLOAD_HTML
 
     def generate_data_source_status(self):
         """Generate data source status indicators"""
@@ -707,40 +923,40 @@ class EnhancedHandler(BaseHTTPRequestHandler):
             ("rfid_readings.jsonl", "📡 RFID Data")
         ]
         
-        html = ""
+        # Check both original location and uploads, one directory listing each
+        original_names = _dir_names("data/input")
+        upload_names = _dir_names("data/uploads")
+        
+        parts = []
         for filename, display_name in sources:
-            # Check both original location and uploads
-            original_path = f"data/input/{filename}"
-            upload_path = f"data/uploads/{filename}"
-            
-            if os.path.exists(upload_path):
+            if filename in upload_names:
                 status = "🟢 Uploaded"
                 source = "Custom"
-            elif os.path.exists(original_path):
+            elif filename in original_names:
                 status = "🟡 Default"
                 source = "Built-in"
             else:
                 status = "🔴 Missing"
                 source = "None"
             
-            html += f"""
+            parts.append(f"""
             <div class="source-item">
                 <strong>{display_name}</strong><br>
                 <span style="font-size: 0.9em;">{status}</span><br>
                 <small>{source}</small>
             </div>
-            """
+            """)
         
-        return html
+        return "".join(parts)
 
     def generate_alert_html(self, events):
         """Generate HTML for fraud alerts"""
         if not events:
             return "<p>No fraud events detected</p>"
         
-        html = ""
+        parts = []
         for i, event in enumerate(events[:5], 1):
-            html += f"""
+            parts.append(f"""
             <div class="alert-item">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
                     <span style="font-weight: bold; font-size: 1.1em;">{i}. {event.get('product', 'Unknown')}</span>
@@ -752,13 +968,13 @@ class EnhancedHandler(BaseHTTPRequestHandler):
                     <div><strong>Quantity:</strong> {event.get('previous_qty', 0)} → {event.get('current_qty', 0)}</div>
                 </div>
             </div>
-            """
+            """)
         
-        return html
+        return "".join(parts)
 
 def start_enhanced_server():
     """Start the enhanced web server"""
-    server = HTTPServer(('localhost', 8080), EnhancedHandler)
+    server = ThreadingHTTPServer(('localhost', 8080), EnhancedHandler)
     print("🌐 Starting enhanced web dashboard server...")
     print("📊 Dashboard URL: http://localhost:8080")
     print("📤 Upload Page: http://localhost:8080/upload")
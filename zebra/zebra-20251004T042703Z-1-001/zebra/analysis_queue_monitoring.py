@@ -17,6 +17,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
+from operator import itemgetter
 import statistics
 
 # @algorithm DwellTimeAnomalyDetection | Detects unusual customer dwell times indicating potential issues
@@ -107,7 +108,9 @@ class CongestionAnalyzer:
         
         # Analyze each station
         for station_id, records in station_data.items():
-            records.sort(key=lambda x: datetime.fromisoformat(x['timestamp']))
+            # Timestamps are uniform ISO-8601 strings (no offsets), so they sort
+            # lexicographically in chronological order without parsing
+            records.sort(key=itemgetter('timestamp'))
             
             congested_periods = []
             current_congestion = None